@@ -2,15 +2,25 @@ from core.detection import MatchDetectionHandler
 from core.local_api import LockfileHandler
 from core.valorant_uuid import UUIDHandler
 from core.skins import SkinHandler
+from core.http_client import http_client
+from core.match_cache import MatchCache
+from core.single_flight import SingleFlight
+from core.name_cache import NameCache
+from core.ttl_cache import TTLCache, STALE
+from core.schemas import match_details_decoder, match_history_decoder, mmr_decoder
+from core.stat_engine import PlayerStatColumns, RunningStats, MatchSummary, MatchSummaryIndex
 from concurrent.futures import ThreadPoolExecutor
-import requests
 import sys
 import os
-import math
 import time
 import asyncio
 import json
-import aiohttp
+import msgspec
+
+MMR_TTL = 5 * 60           # Seconds an MMR lookup is used as-is
+MMR_STALE_TTL = 60 * 60    # Seconds after that it's still shown while being refreshed in the background
+PREFETCH_CONCURRENCY = 4    # Requests a prefetch run has in flight at once
+PREFETCH_MAX_REQUESTS = 110 # Histories + match details a single prefetch run is allowed to download
 
 class ValoRank:
     def __init__(self):
@@ -21,8 +31,8 @@ class ValoRank:
         self.ca = {}  # Current Agent
         self.zero_check = {}    # Total amount of competitive matches a player has that can be loaded
         self.mmr = {}
-        self.match_stats = {}
-        self.pip = {}   # Duplicate of player_info_pre so that it doesn't get lost when you load into a match
+        self.running_stats = {}     # PUUID → RunningStats over every match loaded so far
+        self.pip = None   # Duplicate of player_info_pre so that it doesn't get lost when you load into a match
         self.handler = None
         self.start = 5
         self.end = 15
@@ -31,8 +41,19 @@ class ValoRank:
         self.done = 0
         self.uuid_handler = UUIDHandler()
         self.uuid_handler.agent_uuid_function()
+        self.uuid_handler.season_index_function()
         self.skin_handler = SkinHandler()
-        self.version_data = requests.get("https://valorant-api.com/v1/version").json()
+        self.match_cache = MatchCache()
+        self.match_index = MatchSummaryIndex()   # Per-match player rows, shared by everyone who played the match
+        self.single_flight = SingleFlight()
+        self.name_cache = NameCache()
+        self.names = {}     # Riot IDs for the current match, resolved in one batch
+        self.mmr_cache = TTLCache(MMR_TTL, MMR_STALE_TTL)   # Outlives self.mmr, which is reset every match
+        self.background_tasks = set()
+        self.prefetched = {}    # (PUUID, startIndex) → PlayerStatColumns for the next "Load More Matches" page
+        self.prefetch_task = None
+        self.on_update = None   # Window callback rows are streamed to while valo_stats/load_more_matches run
+        self.version_data = http_client.get("https://valorant-api.com/v1/version").json()
         self.gamemode_list = {
             "Swiftplay": "Swiftplay",
             "Deathmatch": "Deathmatch",
@@ -69,46 +90,47 @@ class ValoRank:
             27: "Radiant"
         }
 
-    # Refreshes frontend
+    # Hands the rows we have so far to the window, called as soon as each player's row is ready
     async def updater_func(self, on_update):
         if on_update:
             on_update(self.frontend_data)
-        await asyncio.sleep(0.05)
+        await asyncio.sleep(0)
 
     async def lobby_load(self):
         try:
             self.handler.in_match
         except:
+            # Forget the match too, or coming back to it (e.g. after one failed poll) would skip every player
+            self.cancel_prefetch()
+            self.last_match_id = None
+            self.used_puuids = []
             self.frontend_data = {}
             if self.handler.party_id.status_code == 200:
                 self.handler.party_id = self.handler.party_id.json()
                 print(self.handler.party_id["CurrentPartyID"])
-                party_info = requests.get(
-                    f"https://glz-eu-1.eu.a.pvp.net/parties/v1/parties/{self.handler.party_id["CurrentPartyID"]}",
+                party_info = (await http_client.request(
+                    "GET",
+                    self.handler.routes.url("party", party_id=self.handler.party_id["CurrentPartyID"]),
                     headers=self.handler.match_id_header
-                ).json()
+                )).json()
                 pmi = []    # Party Members Info
                 print(party_info)
                 for player in party_info["Members"]:
                     pmi.append({
                         "puuid": player.get("Subject"),
                         "rank_up": player.get("CompetitiveTier"),    # Rank unpatched
-                        "level": player.get("PlayerIdentity")("AccountLevel"),
+                        "level": player.get("PlayerIdentity", {}).get("AccountLevel"),
                         "name": None,
                         "tag": None
                     })
                 puuids = []
                 for player in pmi:
                     puuids.append(player.get("puuid"))
-                nt = requests.put(
-                    "https://pd.eu.a.pvp.net/name-service/v2/players",
-                    json=[puuids],
-                    headers={**self.handler.match_id_header, "Content-Type": "application/json"}
-                ).json()
-
-                for index, player in pmi:
-                    self.frontend_data[pmi[index]["puuid"]] = {
-                        "name": f"{nt[index]['GameName']}#{nt[index]['TagLine']}",
+                names = await self.resolve_names(puuids)
+
+                for player in pmi:
+                    self.frontend_data[player["puuid"]] = {
+                        "name": names.get(player["puuid"], "Unknown"),
                         "agent": "N/A",
                         "level": player.get("level"),
                         "matches": "N/A",
@@ -124,14 +146,10 @@ class ValoRank:
                     }
             else:
                 puuid = self.handler.user_puuid
-                nt = requests.put(
-                    "https://pd.eu.a.pvp.net/name-service/v2/players",
-                    json=[puuid],
-                    headers={**self.handler.match_id_header, "Content-Type": "application/json"}
-                ).json()
+                names = await self.resolve_names([puuid])
 
                 self.frontend_data[puuid] = {
-                    "name": f"{nt[0]['GameName']}#{nt[0]['TagLine']}",
+                    "name": names.get(puuid, "Unknown"),
                     "agent": "N/A",
                     "level": "N/A",
                     "matches": "N/A",
@@ -146,15 +164,158 @@ class ValoRank:
                     "team": "Red"
                 }
 
+    # Resolves Riot IDs for every PUUID in one name-service call, skipping anyone already in the name cache
+    async def resolve_names(self, puuids):
+        names = {}
+        unresolved = []
+        for puuid in puuids:
+            name = self.name_cache.get(puuid)
+            if name:
+                names[puuid] = name
+            elif puuid not in unresolved:
+                unresolved.append(puuid)
+
+        if unresolved:
+            response = await http_client.request(
+                "PUT",
+                self.handler.routes.url("name_service"),
+                json=unresolved,
+                headers={**self.handler.match_id_header, "Content-Type": "application/json"}
+            )
+            if response.status_code == 200:
+                for player in response.json():
+                    self.name_cache.update(player["Subject"], player["GameName"], player["TagLine"])
+                    names[player["Subject"]] = f"{player['GameName']}#{player['TagLine']}"
+                await asyncio.to_thread(self.name_cache.save)
+            else:
+                print(f"❌ Error {response.status_code} resolving names")
+
+        return names
+
+    # Turns a decoded /mmr/v1/players response into current and peak rank
+    def build_mmr(self, valorant_mmr):
+        latest = valorant_mmr.latest_competitive_update
+        if latest:
+            peak_rank = 0
+            peak_act = None
+            competitive = (valorant_mmr.queue_skills or {}).get("competitive")
+            seasons = competitive.seasonal_info_by_season_id if competitive else None
+            for season, info in (seasons or {}).items():
+                for tier in info.wins_by_tier or {}:
+                    if int(tier) > peak_rank:
+                        peak_rank = int(tier)
+                        peak_act = season
+
+            peak_season = self.uuid_handler.season_uuid_function(peak_act)
+            prefix = peak_season[0:2]
+
+            if prefix in ("e1", "e2", "e3", "e4") and peak_rank > 20:
+                mmr = {
+                    "current_data": {
+                        "currenttierpatched": self.ttr[latest.tier_after_update],
+                        "ranking_in_tier": latest.ranked_rating_after_update
+                    },
+                    "highest_rank": {
+                        "patched_tier": self.ttr[peak_rank + 3],
+                        "peak_act": peak_season,
+                        "season": peak_season
+                    }
+                }
+
+            mmr = {
+                "current_data": {
+                    "currenttierpatched": self.ttr[latest.tier_after_update],
+                    "ranking_in_tier": latest.ranked_rating_after_update
+                },
+                "highest_rank": {
+                    "patched_tier": self.ttr[peak_rank],
+                    "peak_act": peak_season,
+                    "season": peak_season
+                }
+            }
+        else:
+            mmr = {
+                "current_data": {
+                    "currenttierpatched": "Unranked",
+                    "ranking_in_tier": 0
+                },
+                "highest_rank": {
+                    "patched_tier": "Unranked",
+                    "peak_act": "N/A",
+                    "season": "N/A"
+                }
+            }
+
+        mmr["highest_rank"]["patched_tier"] = mmr["highest_rank"]["patched_tier"].replace("Unset","Unranked")
+        mmr["highest_rank"]["patched_tier"] = mmr["highest_rank"]["patched_tier"].replace("Unrated", "Unranked")
+
+        mmr["current_data"]["currenttierpatched"] = mmr["current_data"]["currenttierpatched"].replace("Unset", "Unranked")
+        mmr["current_data"]["currenttierpatched"] = mmr["current_data"]["currenttierpatched"].replace("Unrated", "Unranked")
+
+        return mmr
+
+    # MMR is cached per PUUID across lobby, pregame, in-game and consecutive matches.
+    # A stale entry is returned straight away and refreshed in the background for the next refresh.
+    # None when there's nothing cached and Riot didn't answer, rather than showing the player as Unranked
+    async def get_mmr(self, puuid):
+        mmr, state = self.mmr_cache.get(puuid)
+        if state == STALE:
+            task = asyncio.create_task(self.single_flight.do(f"mmr:{puuid}", self.fetch_mmr, puuid))
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+        if mmr is None:
+            mmr = await self.single_flight.do(f"mmr:{puuid}", self.fetch_mmr, puuid)
+        return mmr
+
+    async def fetch_mmr(self, puuid):
+        response = await http_client.request(
+            "GET",
+            self.handler.routes.url("mmr", puuid=puuid),
+            headers=self.modified_header
+        )
+        if response.status_code != 200:
+            print(f"❌ Error {response.status_code} fetching MMR for {puuid}")
+            return None
+
+        valorant_mmr = mmr_decoder.decode(response.content)
+        print(valorant_mmr)
+
+        # build_mmr can refresh the season index over the network when it sees an unknown act
+        mmr = await asyncio.to_thread(self.build_mmr, valorant_mmr)
+        self.mmr_cache.set(puuid, mmr)
+        return mmr
+
+    # Red/Blue side of a player, pregame only shows our own team
+    def team_of(self, puuid):
+        if self.handler.player_info:
+            for player in self.handler.player_info.players or []:
+                if player.subject == puuid:
+                    return player.team_id
+        elif self.handler.player_info_pre:
+            return self.handler.player_info_pre.ally_team.team_id
+
+    # Account level from the pregame/core-game player list, for when no match details could be loaded
+    def level_of(self, puuid):
+        if self.handler.player_info:
+            players = self.handler.player_info.players
+        elif self.handler.player_info_pre and self.handler.player_info_pre.ally_team:
+            players = self.handler.player_info_pre.ally_team.players
+        else:
+            players = None
+        for player in players or []:
+            if player.subject == puuid and player.identity:
+                return player.identity.account_level
+        return "N/A"
+
     # Gamemode and server detection function
     def gs_func(self):
         self.gs = []
         if self.handler.player_info_pre:
-            self.gs.append(self.handler.player_info_pre["Mode"])
-            self.gs.append(self.handler.player_info_pre["GamePodID"])
+            self.gs.append(self.handler.player_info_pre.mode)
+            self.gs.append(self.handler.player_info_pre.game_pod_id)
         elif self.handler.player_info:
-            self.gs.append(self.handler.player_info["ModeID"])
-            self.gs.append(self.handler.player_info["GamePodID"])
+            self.gs.append(self.handler.player_info.mode_id)
+            self.gs.append(self.handler.player_info.game_pod_id)
 
         if self.gs:
             try:
@@ -172,12 +333,16 @@ class ValoRank:
 
             if self.gs[0] == "Competitive":
                 if self.handler.player_info_pre:
-                    if self.handler.player_info_pre["IsRanked"] == 0:
+                    if self.handler.player_info_pre.is_ranked == 0:
                         self.gs[0] = "Unrated"
 
-    async def valo_stats(self):
-        self.handler = MatchDetectionHandler()
-        await asyncio.to_thread(self.handler.player_info_retrieval)
+    # handler can be one the match watcher has already polled, so the match isn't looked up twice
+    async def valo_stats(self, on_update=None, handler=None):
+        self.on_update = on_update
+        if handler is None:
+            handler = MatchDetectionHandler()
+            await asyncio.to_thread(handler.player_info_retrieval)
+        self.handler = handler
 
         try:
             current_match_id = self.handler.in_match
@@ -186,6 +351,8 @@ class ValoRank:
             return
 
         if self.last_match_id != current_match_id:
+            self.cancel_prefetch()
+            self.prefetched = {}
             self.used_puuids = []
             self.last_match_id = current_match_id
             self.frontend_data = {}
@@ -193,8 +360,8 @@ class ValoRank:
             self.ca = {}
             self.zero_check = {}
             self.mmr = {}
-            self.match_stats = {}
-            self.pip = {}
+            self.running_stats = {}
+            self.pip = None
             self.start = 5
             self.end = 15
             self.gs = []
@@ -208,140 +375,66 @@ class ValoRank:
 
         if self.handler.player_info:
             if not self.cmp:
-                for player in self.handler.player_info["Players"]:
-                    self.cmp.append(player.get("Subject"))
+                for player in self.handler.player_info.players or []:
+                    self.cmp.append(player.subject)
             elif len(self.cmp) < 10:
-                for player in self.handler.player_info["Players"]:
+                for player in self.handler.player_info.players or []:
                     try:
-                        if player["TeamID"] != self.pip["AllyTeam"]["TeamID"]:
-                            self.cmp.append(player.get("Subject"))
+                        if player.team_id != self.pip.ally_team.team_id:
+                            self.cmp.append(player.subject)
                     except:
                         pass
 
         elif self.pip:
             if not self.cmp:
-                for player in self.pip["AllyTeam"]["Players"]:
-                    self.cmp.append(player.get("Subject"))
+                for player in self.pip.ally_team.players or []:
+                    self.cmp.append(player.subject)
 
         if self.cmp:
             if len(self.ca) < 10:
                 self.ca = {}
                 if self.handler.player_info:
-                    for player in self.handler.player_info["Players"]:
-                        self.ca[player.get("Subject")] = player.get("CharacterID")
+                    for player in self.handler.player_info.players or []:
+                        self.ca[player.subject] = player.character_id
                 else:
-                    for player in self.pip["AllyTeam"]["Players"]:
-                        self.ca[player.get("Subject")] = player.get("CharacterID")
+                    for player in self.pip.ally_team.players or []:
+                        self.ca[player.subject] = player.character_id
 
         self.modified_header = self.handler.match_id_header
         self.modified_header["X-Riot-ClientVersion"] = self.version_data["data"]["riotClientVersion"]
 
         print(self.cmp)
+        self.names = await self.resolve_names([puuid for puuid in self.cmp if puuid not in self.used_puuids])
+
         async def stat_collector(puuid):
             if puuid in self.used_puuids:
                 return
             else:
-                self.valorant_mmr = None
-
-                self.valorant_mmr = requests.get(
-                    f"https://pd.eu.a.pvp.net/mmr/v1/players/{puuid}",
-                    headers=self.modified_header
-                ).json()
-
-                print(self.valorant_mmr)
-
-                if self.valorant_mmr["LatestCompetitiveUpdate"]:
-                    peak_rank = 0
-                    peak_act = None
-                    for season in self.valorant_mmr["QueueSkills"]["competitive"]["SeasonalInfoBySeasonID"]:
-                        try:
-                            for tier in self.valorant_mmr["QueueSkills"]["competitive"]["SeasonalInfoBySeasonID"][season]["WinsByTier"]:
-                                if int(tier) > peak_rank:
-                                    peak_rank = int(tier)
-                                    peak_act = season
-                        except TypeError:
-                            continue
-
-                    prefix = self.uuid_handler.season_uuid_function(peak_act)[0:2]
-
-                    if prefix in ("e1", "e2", "e3", "e4") and peak_rank > 20:
-                        self.mmr[puuid] = {
-                            "current_data": {
-                                "currenttierpatched": self.ttr[self.valorant_mmr["LatestCompetitiveUpdate"]["TierAfterUpdate"]],
-                                "ranking_in_tier": self.valorant_mmr["LatestCompetitiveUpdate"][
-                                    "RankedRatingAfterUpdate"]
-                            },
-                            "highest_rank": {
-                                "patched_tier": self.ttr[peak_rank + 3],
-                                "peak_act": self.uuid_handler.season_uuid_function(peak_act),
-                                "season": self.uuid_handler.season_uuid_function(peak_act)
-                            }
-                        }
-
-                    self.mmr[puuid] = {
-                        "current_data": {
-                            "currenttierpatched": self.ttr[self.valorant_mmr["LatestCompetitiveUpdate"]["TierAfterUpdate"]],
-                            "ranking_in_tier": self.valorant_mmr["LatestCompetitiveUpdate"]["RankedRatingAfterUpdate"]
-                        },
-                        "highest_rank": {
-                            "patched_tier": self.ttr[peak_rank],
-                            "peak_act": self.uuid_handler.season_uuid_function(peak_act),
-                            "season": self.uuid_handler.season_uuid_function(peak_act)
-                        }
-                    }
-                else:
-                    self.mmr[puuid] = {
-                        "current_data": {
-                            "currenttierpatched": "Unranked",
-                            "ranking_in_tier": 0
-                        },
-                        "highest_rank": {
-                            "patched_tier": "Unranked",
-                            "peak_act": "N/A",
-                            "season": "N/A"
-                        }
-                    }
-
-                self.mmr[puuid]["highest_rank"]["season"] = self.mmr[puuid]["highest_rank"]["season"].replace("e10", "v25")
-                self.mmr[puuid]["highest_rank"]["season"] = self.mmr[puuid]["highest_rank"]["season"].replace("e11", "v26")
-
-                self.mmr[puuid]["highest_rank"]["patched_tier"] = self.mmr[puuid]["highest_rank"]["patched_tier"].replace("Unset","Unranked")
-                self.mmr[puuid]["highest_rank"]["patched_tier"] = self.mmr[puuid]["highest_rank"]["patched_tier"].replace("Unrated", "Unranked")
-
-                self.mmr[puuid]["current_data"]["currenttierpatched"] = self.mmr[puuid]["current_data"]["currenttierpatched"].replace("Unset", "Unranked")
-                self.mmr[puuid]["current_data"]["currenttierpatched"] = self.mmr[puuid]["current_data"]["currenttierpatched"].replace("Unrated", "Unranked")
-
-                self.riot_matches = requests.get(
-                    f"https://pd.eu.a.pvp.net/match-history/v1/history/{puuid}?startIndex={0}&endIndex={5}&queue=competitive",
-                    headers=self.handler.match_id_header
-                ).json()
+                mmr = await self.get_mmr(puuid)
+                # Left out of used_puuids so the next refresh tries them again
+                if mmr is None:
+                    return
+                self.mmr[puuid] = mmr
 
-                self.zero_check[puuid] = (self.riot_matches["Total"])
+                riot_matches = await self.fetch_history(puuid, 0, 5)
+                # Left out of used_puuids so the next refresh tries them again
+                if riot_matches is None:
+                    return
 
-                if self.riot_matches["Total"] == 0:
-                    self.riot_name = requests.get(
-                        f"https://pd.eu.a.pvp.net/match-history/v1/history/{puuid}?startIndex={0}&endIndex={1}",
-                        headers=self.handler.match_id_header
-                    ).json()
+                self.zero_check[puuid] = (riot_matches.total)
 
-                    if self.riot_name["Total"] == 0:
-                        nt = requests.put(
-                            "https://pd.eu.a.pvp.net/name-service/v2/players",
-                            json = [puuid],
-                            headers={**self.handler.match_id_header, "Content-Type": "application/json"}
-                        ).json()
+                if riot_matches.total == 0:
+                    riot_name = await self.fetch_history(puuid, 0, 1, queue=None)
+                    if riot_name is None:
+                        return
 
-                        print(f"{nt[0]["GameName"]}#{nt[0]["TagLine"]} ({self.uuid_handler.agent_converter(self.ca[puuid])}) has not played a game in the last 30 days")
+                    if riot_name.total == 0:
+                        print(f"{self.names.get(puuid, 'Unknown')} ({self.uuid_handler.agent_converter(self.ca[puuid])}) has not played a game in the last 30 days")
 
-                        if self.handler.player_info:
-                            for player in self.handler.player_info["Players"]:
-                                if player["Subject"] == puuid:
-                                    bor = player["TeamID"]
-                        elif self.handler.player_info_pre:
-                            bor = self.handler.player_info_pre["AllyTeam"]["TeamID"]
+                        bor = self.team_of(puuid)
 
                         self.frontend_data[puuid] = {
-                            "name": f"{nt[0]['GameName']}#{nt[0]['TagLine']}",
+                            "name": self.names.get(puuid, "Unknown"),
                             "agent": self.uuid_handler.agent_converter(self.ca[puuid]),
                             "level": "N/A",
                             "matches": 0,
@@ -356,36 +449,27 @@ class ValoRank:
                             "team": bor
                         }
                         self.used_puuids.append(puuid)
-                        await self.assign_skins()
+                        await self.updater_func(self.on_update)
                         return
 
-                    match_id_name = self.riot_name["History"][0]["MatchID"]
-                    match_stats_name = requests.get(
-                        f"https://pd.eu.a.pvp.net/match-details/v1/matches/{match_id_name}",
-                        headers=self.handler.match_id_header
-                    ).json()
-                    ntl = []    # Name Tag Level
-                    for player in match_stats_name["players"]:
-                        if player["subject"] == puuid:
-                            ntl.append({
-                                "name": player.get("gameName"),
-                                "tag": player.get("tagLine"),
-                                "level": player.get("accountLevel"),
-                            })
-
-                    print(f"{ntl[0]["name"]}#{ntl[0]["tag"]} ({self.uuid_handler.agent_converter(self.ca[puuid])}) has not played competitive in the last 30 days/100 matches")
-
-                    if self.handler.player_info:
-                        for player in self.handler.player_info["Players"]:
-                            if player["Subject"] == puuid:
-                                bor = player["TeamID"]
-                    elif self.handler.player_info_pre:
-                        bor = self.handler.player_info_pre["AllyTeam"]["TeamID"]
+                    match_id_name = riot_name.history[0].match_id
+                    match_summary_name = await self.fetch_match(match_id_name)
+                    player = match_summary_name.player(puuid) if match_summary_name else None
+                    if player:
+                        name, level = f"{player.game_name}#{player.tag_line}", player.account_level
+                        self.name_cache.update(puuid, player.game_name, player.tag_line)
+                    else:
+                        # Match details failed to load, fall back to the name lookup and the lobby's level
+                        name, level = self.names.get(puuid, "Unknown"), self.level_of(puuid)
+
+                    print(f"{name} ({self.uuid_handler.agent_converter(self.ca[puuid])}) has not played competitive in the last 30 days/100 matches")
+
+                    bor = self.team_of(puuid)
 
                     self.frontend_data[puuid] = {
-                        "name": f"{ntl[0]['name']}#{ntl[0]['tag']}",
+                        "name": name,
                         "agent": self.uuid_handler.agent_converter(self.ca[puuid]),
-                        "level": ntl[0]["level"],
+                        "level": level,
                         "matches": 0,
                         "wl": "N/A",
                         "acs": "N/A",
@@ -398,114 +482,91 @@ class ValoRank:
                         "team": bor
                     }
                     self.used_puuids.append(puuid)
-                    await self.assign_skins()
+                    await self.updater_func(self.on_update)
                     return
 
                 riot_match_ids = []
-                for match in self.riot_matches["History"]:
-                    riot_match_ids.append(match["MatchID"])
+                for match in riot_matches.history or []:
+                    riot_match_ids.append(match.match_id)
 
 
-                match_urls = []
-                for matchID in riot_match_ids:
-                    match_urls.append(f"https://pd.eu.a.pvp.net/match-details/v1/matches/{matchID}")
-
-
-                async def gather_matches():
-                    async with aiohttp.ClientSession(headers=self.handler.match_id_header) as session:
-                        tasks = [self.fetch(session, match_url) for match_url in match_urls]
-                        self.match_stats[puuid] = await asyncio.gather(*tasks)
-
-                await gather_matches()
+                tasks = [self.fetch_match(match_id) for match_id in riot_match_ids]
+                matches = await asyncio.gather(*tasks)
                 self.used_puuids.append(puuid)
-                await self.calc_stats(puuid)
+                await self.calc_stats(puuid, PlayerStatColumns(puuid, matches))
 
         tasks = [asyncio.create_task(stat_collector(puuid)) for puuid in self.cmp]
         await asyncio.gather(*tasks)
+        await asyncio.to_thread(self.name_cache.save)
 
         for index, puuid in enumerate(self.cmp):
-            self.frontend_data[puuid]["agent"] = self.uuid_handler.agent_converter(self.ca[puuid])
-
-    async def calc_stats(self, puuid):
-        stats_list = []
-        wl_list = []  # tracks wins and losses
-        hs_list = []
-        for match in self.match_stats[puuid]:
-            for player in match["players"]:
-                if player["subject"] == puuid:
-                    stats_list.append({
-                        "name": player.get("gameName"),
-                        "tag": player.get("tagLine"),
-                        "stats": player.get("stats"),
-                        "level": player.get("accountLevel"),
-                        "team": player.get("teamId")
-                    })
+            if puuid in self.frontend_data:
+                self.frontend_data[puuid]["agent"] = self.uuid_handler.agent_converter(self.ca[puuid])
+
+        # Every row is on screen by now, skins are filled in afterwards
+        await self.assign_skins(on_update)
+        self.start_prefetch()
+
+    # Agent select changes from the match watcher, only the agent column needs updating
+    def apply_agents(self, agents):
+        for puuid, agent in agents.items():
+            self.ca[puuid] = agent
+            if puuid in self.frontend_data:
+                self.frontend_data[puuid]["agent"] = self.uuid_handler.agent_converter(agent)
+
+    # Everyone in the match just gained or lost RR, so their cached MMR is out of date
+    def match_ended(self):
+        self.cancel_prefetch()
+        for puuid in self.cmp:
+            self.mmr_cache.invalidate(puuid)
+
+    # Folds a newly loaded page of matches into the player's running totals and refreshes their row
+    async def calc_stats(self, puuid, columns):
+        running = self.running_stats.setdefault(puuid, RunningStats())
+        running.fold(columns)
+        summary = running.summary()
+        skins = self.frontend_data.get(puuid, {}).get("skins")     # Already loaded when called from load_more_matches
+        if summary is None:
+            # Every match failed to load, show the player with empty stats rather than dropping the row
+            print(f"❌ No usable matches for {puuid}")
+            self.frontend_data[puuid] = {
+                "name": self.names.get(puuid, "Unknown"),
+                "agent": self.uuid_handler.agent_converter(self.ca[puuid]),
+                "level": "N/A",
+                "matches": 0,
+                "wl": "N/A",
+                "acs": "N/A",
+                "kd": "N/A",
+                "hs": "N/A",
+                "rank": self.mmr[puuid]["current_data"]["currenttierpatched"],
+                "rr": self.mmr[puuid]["current_data"]["ranking_in_tier"],
+                "peak_rank": self.mmr[puuid]["highest_rank"]["patched_tier"],
+                "peak_act": self.mmr[puuid]["highest_rank"]["season"].upper(),
+                "team": self.team_of(puuid)
+            }
+            if skins:
+                self.frontend_data[puuid]["skins"] = skins
+            await self.updater_func(self.on_update)
+            return
+        player = running.player
+        match_count = summary["matches"]
+        wl = f"{summary['wl']}%"
+        acs = summary["acs"]
+        kd = summary["kd"]
+        hs = summary["hs"]
 
-        for i, match in enumerate(self.match_stats[puuid]):
-            for team in match["teams"]:
-                if team["teamId"] == stats_list[i]["team"]:
-                    wl_list.append(team.get("won"))
-
-
-        for match in self.match_stats[puuid]:
-            for round in match["roundResults"]:
-                for player in round["playerStats"]:
-                    if player["subject"] == puuid:
-                        for round2 in player["damage"]:
-                            hs_list.append({
-                                "legshots": round2.get("legshots"),
-                                "bodyshots": round2.get("bodyshots"),
-                                "headshots": round2.get("headshots")
-                            })
-
-        team = []
-        wins = []
-        match_count_wl = 0
-        for match in wl_list:
-            match_count_wl += 1
-        wl = f"{math.floor(sum(wl_list) / len(wl_list) * 100)}%"
-
-        score = 0
-        rounds_played = 0
-        for match in stats_list:
-            score += match["stats"]["score"]
-            rounds_played += match["stats"]["roundsPlayed"]
-        acs = score / rounds_played
-
-        kills = 0
-        deaths = 0
-        match_count_kd = 0
-        for match in stats_list:
-            match_count_kd += 1
-            kills += match["stats"]["kills"]
-            deaths += match["stats"]["deaths"]
-            if deaths == 0:
-                deaths += 1
-        kd = kills / deaths
-
-        legshots = 0
-        bodyshots = 0
-        headshots = 0
-        for round in hs_list:
-            legshots += round["legshots"]
-            bodyshots += round["bodyshots"]
-            headshots += round["headshots"]
-        hs = (headshots / (legshots + bodyshots + headshots)) * 100
+        bor = self.team_of(puuid)
 
-        if self.handler.player_info:
-            for player in self.handler.player_info["Players"]:
-                if player["Subject"] == puuid:
-                    bor = player["TeamID"]
-        elif self.handler.player_info_pre:
-            bor = self.handler.player_info_pre["Teams"][0]["TeamID"]
+        # Most recent match has the player's current Riot ID, keeps the name cache up to date after a rename
+        self.name_cache.update(puuid, player.game_name, player.tag_line)
 
         if self.mmr[puuid]["current_data"]["currenttierpatched"] == "Unrated":
             self.mmr[puuid]["current_data"]["currenttierpatched"] = "Unranked"
         self.frontend_data[puuid] = {
-            "name": f"{stats_list[0]['name']}#{stats_list[0]['tag']}",
+            "name": f"{player.game_name}#{player.tag_line}",
             "agent": self.uuid_handler.agent_converter(self.ca[puuid]),
-            "level": stats_list[0]['level'],
-            "matches": match_count_kd,
+            "level": player.account_level,
+            "matches": match_count,
             "wl": str(wl),
             "acs": str(acs)[:5],
             "kd": str(kd)[:4],
@@ -516,68 +577,181 @@ class ValoRank:
             "peak_act": self.mmr[puuid]["highest_rank"]["season"].upper(),
             "team": bor
         }
-        await self.assign_skins()
+        if skins:
+            self.frontend_data[puuid]["skins"] = skins
+        await self.updater_func(self.on_update)
 
         print(
-            f"{stats_list[0]['name']}#{stats_list[0]['tag']}'s ({self.uuid_handler.agent_converter(self.ca[puuid])}) level is {stats_list[0]['level']} | W/L % in last {match_count_kd} matches: {wl} | ACS in the last {match_count_kd} matches: {str(acs)[:5]} | KD in last {match_count_kd} matches: {str(kd)[0:4]} | HS in last {match_count_kd} matches: hs is: {str(hs)[:4]}% | current rank is: {self.mmr[puuid]['current_data']['currenttierpatched']} | current rr is: {self.mmr[puuid]['current_data']['ranking_in_tier']} | highest rank was: {self.mmr[puuid]['highest_rank']['patched_tier']} | peak act was: {self.mmr[puuid]['highest_rank']['season']}")
+            f"{player.game_name}#{player.tag_line}'s ({self.uuid_handler.agent_converter(self.ca[puuid])}) level is {player.account_level} | W/L % in last {match_count} matches: {wl} | ACS in the last {match_count} matches: {str(acs)[:5]} | KD in last {match_count} matches: {str(kd)[0:4]} | HS in last {match_count} matches: hs is: {str(hs)[:4]}% | current rank is: {self.mmr[puuid]['current_data']['currenttierpatched']} | current rr is: {self.mmr[puuid]['current_data']['ranking_in_tier']} | highest rank was: {self.mmr[puuid]['highest_rank']['patched_tier']} | peak act was: {self.mmr[puuid]['highest_rank']['season']}")
 
-    async def load_more_matches(self):
-        for puuid in self.cmp:
-            if self.zero_check[puuid] <= self.start:
-                continue
-            else:
-                self.riot_matches_new = requests.get(
-                    f"https://pd.eu.a.pvp.net/match-history/v1/history/{puuid}?startIndex={self.start}&endIndex={self.end}&queue=competitive",
-                    headers=self.handler.match_id_header
-                ).json()
+    async def load_more_matches(self, on_update=None):
+        self.on_update = on_update
+        # Whatever the prefetcher didn't finish is fetched at full priority below
+        self.cancel_prefetch()
 
-                if self.riot_matches_new["Total"] == 0:
-                    continue
+        async def load_more_collector(puuid):
+            columns = self.prefetched.pop((puuid, self.start), None)
+            if columns is None:
+                columns = await self.load_page(puuid, self.start, self.end)
+            if columns is not None:
+                await self.calc_stats(puuid, columns)
 
-                riot_match_ids_new = []
-                for match in self.riot_matches_new["History"]:
-                    riot_match_ids_new.append(match["MatchID"])
+        # Every player's page is loaded at the same time, the rate limiter in http_client keeps us under Riot's limits
+        await asyncio.gather(*(load_more_collector(puuid) for puuid in self.cmp))
+        print("load more matches finished")
 
-                match_urls_new = []
-                for matchID in riot_match_ids_new:
-                    match_urls_new.append(f"https://pd.eu.a.pvp.net/match-details/v1/matches/{matchID}")
+        self.start += 10
+        self.end += 10
+        self.start_prefetch()
 
-                async def gather_matches():
-                    async with aiohttp.ClientSession(headers=self.handler.match_id_header) as session:
-                        tasks = [self.fetch(session, match_url) for match_url in match_urls_new]
-                        self.match_stats[puuid].extend(await asyncio.gather(*tasks))
+    # Fetches one page of a player's competitive history and reduces it to stat columns, None if there's nothing to load
+    async def load_page(self, puuid, start, end, low_priority=False):
+        if self.zero_check.get(puuid, 0) <= start:
+            return None
+        riot_matches_new = await self.fetch_history(puuid, start, end, low_priority=low_priority)
 
-                await gather_matches()
+        if riot_matches_new is None or riot_matches_new.total == 0:
+            return None
 
-                await self.calc_stats(puuid)
+        riot_match_ids_new = []
+        for match in riot_matches_new.history or []:
+            riot_match_ids_new.append(match.match_id)
 
-                print("load more matches finished")
+        tasks = [self.fetch_match(match_id, low_priority) for match_id in riot_match_ids_new]
+        return PlayerStatColumns(puuid, await asyncio.gather(*tasks))
 
-        self.start += 10
-        self.end += 10
+    # Once the table is on screen, quietly load the next "Load More Matches" page so the button is instant
+    def start_prefetch(self):
+        if self.prefetch_task and not self.prefetch_task.done():
+            return
+        self.prefetch_task = asyncio.create_task(self.prefetch_next_page())
+        self.background_tasks.add(self.prefetch_task)
+        self.prefetch_task.add_done_callback(self.background_tasks.discard)
+
+    def cancel_prefetch(self):
+        if self.prefetch_task and not self.prefetch_task.done():
+            self.prefetch_task.cancel()
+        self.prefetch_task = None
+
+    async def prefetch_next_page(self):
+        start, end = self.start, self.end
+        semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        budget = PREFETCH_MAX_REQUESTS    # Charged per request that actually goes out
+
+        async def prefetch_history(puuid):
+            nonlocal budget
+            async with semaphore:
+                if (puuid, start) in self.prefetched or self.zero_check.get(puuid, 0) <= start or budget <= 0:
+                    return puuid, None
+                budget -= 1
+                return puuid, await self.fetch_history(puuid, start, end, low_priority=True)
+
+        async def prefetch_match(match_id):
+            nonlocal budget
+            async with semaphore:
+                # Already summarised or on disk, fetch_match won't download anything
+                if self.match_index.get(match_id) is None and match_id not in self.match_cache:
+                    if budget <= 0:
+                        return
+                    budget -= 1
+                summary = await self.fetch_match(match_id, low_priority=True)
+                # A failed download leaves the page incomplete so load_more_matches retries it
+                if summary is not None:
+                    summaries[match_id] = summary
+
+        try:
+            histories = await asyncio.gather(*(prefetch_history(puuid) for puuid in list(self.cmp)))
+            pages = {
+                puuid: [match.match_id for match in history.history or []]
+                for puuid, history in histories if history is not None and history.total
+            }
+
+            # Premades share most of their history, so each match is downloaded once for every page it's on
+            summaries = {}
+            match_ids = list(dict.fromkeys(match_id for page in pages.values() for match_id in page))
+            await asyncio.gather(*(prefetch_match(match_id) for match_id in match_ids))
+
+            for puuid, page in pages.items():
+                # Pages cut short by the budget or a failed download are left for load_more_matches to fetch
+                if not all(match_id in summaries for match_id in page):
+                    continue
+                # The page moved on (or the match changed) while we were fetching
+                if start == self.start and puuid in self.cmp:
+                    self.prefetched[(puuid, start)] = PlayerStatColumns(puuid, [summaries[match_id] for match_id in page])
+            print(f"prefetched matches {start}-{end} for {len(self.prefetched)} players ({len(match_ids)} unique matches)")
+        except Exception as e:
+            print(f"⚠️ Prefetch failed: {e}")
 
     async def assign_skins(self, on_update=None):
         if len(self.used_puuids) == len(self.cmp):
+            if not self.skin_handler.skins:
+                await self.skin_handler.get_skins(self.handler.in_match, self.handler.match_id_header, self.handler.routes)
             for puuid in self.used_puuids:
-                self.frontend_data[puuid]["skins"] = self.skin_handler.assign_skins(puuid, self.handler.in_match, self.handler.match_id_header)
-
-    async def fetch(self, session, url, retries=3):
-        for attempt in range(retries):
-            async with session.get(url) as response:
-                if response.status == 200:
-                    try:
-                        return await response.json()
-                    except aiohttp.ContentTypeError:
-                        text = await response.text()
-                        print(f"⚠️ Unexpected response type at {url}:\n{text[:200]}...")
-                        return None
-                elif response.status == 429:
-                    retry_after = int(response.headers.get("Retry-After", "2"))
-                    print(f"🚫 Rate limited (429). Retrying in {retry_after}s... ({attempt + 1}/{retries})")
-                    await asyncio.sleep(retry_after)
-                else:
-                    print(f"❌ Error {response.status} fetching {url}")
-                    return None
-
-        print(f"❌ Failed to fetch {url} after {retries} retries.")
-        return None
\ No newline at end of file
+                self.frontend_data[puuid]["skins"] = self.skin_handler.assign_skins(puuid)
+            await self.updater_func(on_update)
+
+    # None when Riot didn't answer, so a failed request isn't mistaken for an empty history
+    async def fetch_history(self, puuid, start, end, queue="competitive", low_priority=False):
+        url = f"{self.handler.routes.url('match_history', puuid=puuid)}?startIndex={start}&endIndex={end}"
+        if queue:
+            url += f"&queue={queue}"
+        response = await http_client.request("GET", url, low_priority=low_priority, headers=self.handler.match_id_header)
+        if response.status_code != 200:
+            print(f"❌ Error {response.status_code} fetching match history for {puuid}")
+            return None
+        return match_history_decoder.decode(response.content)
+
+    # Match details are only ever read as per-player rows, so each match is summarised once
+    # and everyone who played it (now or in a later lobby) reads their row from the same summary
+    async def fetch_match(self, match_id, low_priority=False):
+        summary = self.match_index.get(match_id)
+        if summary is not None:
+            return summary
+
+        url = self.handler.routes.url("match_details", match_id=match_id)
+        # Prefetches skip single_flight so cancelling them really stops the download instead of leaving it shared
+        if low_priority:
+            match = await self._fetch(url, low_priority=True)
+        else:
+            match = await self.fetch(url)
+        if match is None:
+            return None
+
+        # A premade's collector may have summarised it while we were waiting on the shared download
+        summary = self.match_index.get(match_id)
+        if summary is None:
+            summary = MatchSummary.from_details(match_id, match)
+            self.match_index.add(summary)
+        return summary
+
+    # Premades share most of their match history, so concurrent requests for the same URL share one download
+    async def fetch(self, url, retries=3):
+        return await self.single_flight.do(url, self._fetch, url, retries)
+
+    async def _fetch(self, url, retries=3, low_priority=False):
+        # Finished match details never change, so serve them from the on-disk cache when we can
+        match_id = url.rsplit("/", 1)[-1] if "/match-details/" in url else None
+        if match_id:
+            cached = await asyncio.to_thread(self.match_cache.get, match_id)
+            if cached is not None:
+                return match_details_decoder.decode(cached)
+
+        # 429s are paced and retried by the shared rate limiter in http_client
+        response = await http_client.request("GET", url, retries=retries, low_priority=low_priority, headers=self.handler.match_id_header)
+        if response.status_code == 200:
+            try:
+                if not match_id:
+                    return response.json()
+                data = match_details_decoder.decode(response.content)
+                if data.match_info.is_completed:
+                    await asyncio.to_thread(self.match_cache.put, match_id, response.content)
+                return data
+            except (ValueError, msgspec.DecodeError):
+                print(f"⚠️ Unexpected response type at {url}:\n{response.content[:200]}...")
+                return None
+        elif response.status_code == 429:
+            print(f"❌ Failed to fetch {url} after {retries} retries.")
+            return None
+        else:
+            print(f"❌ Error {response.status_code} fetching {url}")
+            return None
\ No newline at end of file
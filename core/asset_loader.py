@@ -1,20 +1,47 @@
 import os
 import re
-import requests
-import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from PySide6.QtGui import QPixmap
+from core.http_client import http_client
+from core.downloader import asset_downloader
+from core.pixmap_cache import SkinPixmapCache
+from core.asset_pack import load_pixmap
 
-def download_and_cache_agent_icons(cache_dir="assets/agents"):
+# QPixmap is imported inside each loader so importing core never pulls in Qt (see core/headless.py)
+
+def load_pixmaps(entries):
+    from PySide6.QtGui import QPixmap
+    return {name: QPixmap(path) for name, path in entries.items()}
+
+def load_pack_pixmaps(pack, section):
+    return {name: load_pixmap(pack.get(section, name)) for name in pack.section(section)}
+
+# Names whose icon URL answered with a 4xx, recorded so the manifest doesn't retry them every launch
+def failed_names(file_map, stats):
+    return [name for name, path in file_map.items() if path in stats.gone]
+
+async def fetch_listing(url):
+    response = await http_client.request("GET", url)
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} returned {response.status_code}")
+    return response.json()["data"]
+
+async def download_and_cache_agent_icons(cache_dir="assets/agents", manifest=None, pack=None, downloader=asset_downloader):
     """Download agent icons once and save them locally (if not already cached)."""
+    if pack and pack.section("agents"):
+        print(f"✅ Loaded {len(pack.section('agents'))} agent icons from the asset pack")
+        return load_pack_pixmaps(pack, "agents")
+
+    cached = manifest.section("agents") if manifest else None
+    if cached:
+        print(f"✅ Loaded {len(cached)} agent icons from the asset manifest")
+        return load_pixmaps(cached)
+
     os.makedirs(cache_dir, exist_ok=True)
 
     print("🖼️ Fetching agent list from Valorant API...")
-    response = requests.get("https://valorant-api.com/v1/agents")
-    response.raise_for_status()
-    agents = response.json()["data"]
+    agents = await fetch_listing("https://valorant-api.com/v1/agents")
 
-    icons = {}
+    download_jobs = []
+    file_map = {}
 
     for agent in agents:
         if not agent.get("isPlayableCharacter", False):
@@ -28,30 +55,37 @@ def download_and_cache_agent_icons(cache_dir="assets/agents"):
         # 🔧 sanitize filename (replace /, \, :, ?, etc.)
         safe_name = re.sub(r'[\\/*?:"<>|]', "_", name)
         file_path = os.path.join(cache_dir, f"{safe_name}.png")
+        file_map[name] = file_path
 
         # Download only if not already cached
         if not os.path.exists(file_path):
-            print(f"⬇️ Downloading {name} icon...")
-            img_data = requests.get(icon_url).content
-            with open(file_path, "wb") as f:
-                f.write(img_data)
+            download_jobs.append((icon_url, file_path))
 
-        # Load QPixmap from local file
-        pixmap = QPixmap(file_path)
-        icons[name] = pixmap
+    stats = await downloader.download_all(download_jobs, label="agent icons")
+    entries = {name: path for name, path in file_map.items() if os.path.exists(path)}
 
-    print(f"✅ Loaded {len(icons)} agent icons (cached in {cache_dir})")
-    return icons
+    if manifest:
+        manifest.update("agents", file_map, failed_names(file_map, stats))
+    print(f"✅ Loaded {len(entries)} agent icons (cached in {cache_dir})")
+    return load_pixmaps(entries)
+
+async def download_and_cache_rank_icons(cache_dir="assets/ranks", manifest=None, pack=None, downloader=asset_downloader):
+    if pack and pack.section("ranks"):
+        print(f"✅ Loaded {len(pack.section('ranks'))} rank icons from the asset pack")
+        return load_pack_pixmaps(pack, "ranks")
+
+    cached = manifest.section("ranks") if manifest else None
+    if cached:
+        print(f"✅ Loaded {len(cached)} rank icons from the asset manifest")
+        return load_pixmaps(cached)
 
-def download_and_cache_rank_icons(cache_dir="assets/ranks"):
     os.makedirs(cache_dir, exist_ok=True)
 
     print("🖼️ Fetching rank icons from Valorant API...")
-    response = requests.get("https://valorant-api.com/v1/competitivetiers")
-    response.raise_for_status()
-    ranks = response.json()["data"][4]["tiers"]
+    ranks = (await fetch_listing("https://valorant-api.com/v1/competitivetiers"))[4]["tiers"]
 
-    icons = {}
+    download_jobs = []
+    file_map = {}
 
     for rank in ranks:
         name = rank["tierName"].capitalize()
@@ -63,45 +97,40 @@ def download_and_cache_rank_icons(cache_dir="assets/ranks"):
         # 🔧 sanitise filename (replace /, \, :, ?, etc.)
         safe_name = re.sub(r'[\\/*?:"<>|]', "_", name)
         file_path = os.path.join(cache_dir, f"{safe_name}.png")
+        file_map[name] = file_path
 
         # Download only if not already cached
         if not os.path.exists(file_path):
-            print(f"⬇️ Downloading {name} icon...")
-            img_data = requests.get(icon_url).content
-            with open(file_path, "wb") as f:
-                f.write(img_data)
+            download_jobs.append((icon_url, file_path))
 
-        # Load QPixmap from local file
-        pixmap = QPixmap(file_path)
-        icons[name] = pixmap
+    stats = await downloader.download_all(download_jobs, label="rank icons")
+    entries = {name: path for name, path in file_map.items() if os.path.exists(path)}
 
-    print(f"✅ Loaded {len(icons)} rank icons (cached in {cache_dir})")
-    return icons
+    if manifest:
+        manifest.update("ranks", file_map, failed_names(file_map, stats))
+    print(f"✅ Loaded {len(entries)} rank icons (cached in {cache_dir})")
+    return load_pixmaps(entries)
 
-async def download_and_cache_skins(cache_dir="assets/skins", threads=40):
+async def download_and_cache_skins(cache_dir="assets/skins", manifest=None, pack=None, downloader=asset_downloader):
     """
-    Downloads ALL Valorant weapon skins + chromas at high speed using multithreading.
+    Downloads ALL Valorant weapon skins + chromas through the shared async download pipeline.
     Saves each icon using its UUID as filename.
-    Returns a dict: {uuid: QPixmap}
+    Returns a SkinPixmapCache that decodes each icon the first time it's shown.
     """
+    if pack and pack.section("skins"):
+        print(f"🎉 Found {len(pack.section('skins'))} skin icons in the asset pack.")
+        return SkinPixmapCache.from_pack(pack)
 
-    def download_file(url, path):
-        """Download a single PNG file to path."""
-        try:
-            data = requests.get(url, timeout=5).content
-            with open(path, "wb") as f:
-                f.write(data)
-            return True
-        except Exception:
-            return False
+    cached = manifest.section("skins") if manifest else None
+    if cached:
+        print(f"🎉 Found {len(cached)} skin icons in the asset manifest.")
+        return SkinPixmapCache(cached)
 
     # Prepare directory
     os.makedirs(cache_dir, exist_ok=True)
 
     print("🖼️ Fetching skins + chromas from Valorant API...")
-    response = requests.get("https://valorant-api.com/v1/weapons/skins")
-    response.raise_for_status()
-    skins = response.json()["data"]
+    skins = await fetch_listing("https://valorant-api.com/v1/weapons/skins")
 
     download_jobs = []   # list of (url, path)
     file_map = {}        # uuid → local filepath
@@ -130,30 +159,18 @@ async def download_and_cache_skins(cache_dir="assets/skins", threads=40):
                     download_jobs.append((icon, chroma_path))
 
     print(f"📦 {len(download_jobs)} icons to download (uncached).")
-    print(f"🚀 Starting downloads using {threads} threads...")
-
-    # Multithreaded downloads
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        futures = [
-            executor.submit(download_file, url, path)
-            for url, path in download_jobs
-        ]
-
-        for i, fut in enumerate(as_completed(futures), 1):
-            print(f"✔ {i}/{len(futures)}", end="\r")
+    stats = await downloader.download_all(download_jobs, label="skin icons")
 
-    print("\n✅ Download complete. Loading pixmaps...")
-
-    async def load_pixmap(path):
-        return await asyncio.to_thread(QPixmap, path)
-
-    # Load images into QPixmap
-    pixmaps = {}
+    # Pixmaps are only decoded when a popup shows them
+    entries = {}
     for uuid, file_path in file_map.items():
         if os.path.exists(file_path):
-            pixmaps[uuid] = await load_pixmap(file_path)
+            entries[uuid] = file_path
+
+    if manifest:
+        manifest.update("skins", file_map, failed_names(file_map, stats))
 
-    print(f"🎉 Loaded {len(pixmaps)} total icons.")
-    return pixmaps
+    print(f"🎉 Found {len(entries)} total icons.")
+    return SkinPixmapCache(entries)
 
 
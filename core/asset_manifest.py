@@ -0,0 +1,53 @@
+import os
+import json
+from core.atomic_file import write_atomic
+
+MANIFEST_PATH = "cache/asset_manifest.json"
+
+
+class AssetManifest:
+    """
+    Records which local file holds each agent, rank and skin icon, stamped with the game content version
+    (valorant-api.com /v1/version) it was built for.
+    While the version matches and every file is still on disk the loaders read straight from it
+    and skip the valorant-api.com listings, so a warm start does no network I/O for assets.
+    """
+
+    def __init__(self, version, path=MANIFEST_PATH):
+        self.version = version
+        self.path = path
+        self.sections = {}
+        self.failed = {}    # section → names whose icon URL is permanently broken for this version
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        # A new patch can add agents/skins or change icons, everything gets rebuilt once
+        if manifest.get("version") == self.version:
+            self.sections = manifest.get("sections", {})
+            self.failed = manifest.get("failed", {})
+
+    # name → file path for a section, or None if it has to be rebuilt from valorant-api.com.
+    # Sections list every icon the listing had, so one that failed to download makes the whole section stale.
+    # Icons whose URL is permanently broken are left out instead, or the section would never validate again
+    def section(self, name):
+        entries = self.sections.get(name)
+        if not entries:
+            return None
+        failed = set(self.failed.get(name, []))
+        entries = {key: path for key, path in entries.items() if key not in failed}
+        if not all(os.path.exists(path) for path in entries.values()):
+            return None
+        return entries
+
+    def update(self, name, entries, failed=()):
+        self.sections[name] = entries
+        self.failed[name] = sorted(failed)
+        self.save()
+
+    def save(self):
+        write_atomic(self.path, json.dumps({"version": self.version, "sections": self.sections, "failed": self.failed}))
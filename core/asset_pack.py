@@ -0,0 +1,103 @@
+import os
+import mmap
+import json
+import struct
+from core.atomic_file import atomic_path
+
+PACK_PATH = "cache/assets.pack"
+PACK_MAGIC = b"WWTBPAK1"
+HEADER = struct.Struct("<8sI")     # magic, index length in bytes
+
+
+class AssetPack:
+    """
+    Every agent, rank and skin icon packed into one file, built by tools/build_asset_pack.py.
+
+        [magic][index length][index JSON][PNG][PNG]...
+
+    The index maps section → name → (offset, length), with offsets counted from the end of the index,
+    and carries the game content version it was built from.
+    Opening the pack is one file open and one mmap; get() returns a memoryview into the mapping,
+    so looking an icon up is a dict hit and only the icons actually shown are read from disk.
+    """
+
+    def __init__(self, buffer, data_start, version, sections):
+        self.buffer = buffer
+        self.data_start = data_start
+        self.view = memoryview(buffer)
+        self.version = version
+        self.sections = sections
+
+    @classmethod
+    def open(cls, version, path=PACK_PATH):
+        """Maps the pack at path, or returns None if it's missing, damaged or built for another content version."""
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        try:
+            magic, index_length = HEADER.unpack_from(buffer, 0)
+            if magic != PACK_MAGIC:
+                raise ValueError("not an asset pack")
+            index = json.loads(buffer[HEADER.size:HEADER.size + index_length])
+        except (struct.error, ValueError) as e:
+            print(f"⚠️ Ignoring asset pack {path}: {e}")
+            buffer.close()
+            return None
+
+        if index.get("version") != version:
+            buffer.close()
+            return None
+        return cls(buffer, HEADER.size + index_length, index["version"], index.get("sections", {}))
+
+    # name → (offset, length) for a section, or None if the pack doesn't have it
+    def section(self, name):
+        return self.sections.get(name) or None
+
+    def get(self, section, name):
+        entry = self.sections.get(section, {}).get(name)
+        if entry is None:
+            return None
+        offset = self.data_start + entry[0]
+        return self.view[offset:offset + entry[1]]
+
+    def close(self):
+        self.view.release()
+        self.buffer.close()
+
+
+# PySide6 won't take a read-only memoryview, and Qt copies the PNG into its own buffer anyway
+def load_pixmap(data):
+    from PySide6.QtGui import QPixmap
+    pixmap = QPixmap()
+    pixmap.loadFromData(bytes(data))
+    return pixmap
+
+
+def build_pack(version, sections, path=PACK_PATH):
+    """
+    Packs {section: {name: file path}} into path, written to a temp file and renamed into place.
+    Returns the number of files packed.
+    """
+    index = {}
+    files = []
+    offset = 0
+    for section, entries in sections.items():
+        index[section] = {}
+        for name, file_path in entries.items():
+            length = os.path.getsize(file_path)
+            index[section][name] = [offset, length]
+            files.append(file_path)
+            offset += length
+
+    index_bytes = json.dumps({"version": version, "sections": index}).encode("utf-8")
+
+    with atomic_path(path) as tmp_path, open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(PACK_MAGIC, len(index_bytes)))
+        out.write(index_bytes)
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                out.write(f.read())
+    return len(files)
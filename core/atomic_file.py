@@ -0,0 +1,27 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+# Yields a temp path next to path and renames it into place once the block finishes without raising,
+# so a crash or a reader on another thread never sees a half-written cache or asset file
+@contextmanager
+def atomic_path(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"     # Per thread, several workers can write the same file
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_atomic(path, data):
+    with atomic_path(path) as tmp_path:
+        if isinstance(data, str):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
@@ -1,6 +1,8 @@
-import requests
+from core.http_client import http_client
 import json
 from core.local_api import LockfileHandler
+from core.schemas import player_match_decoder, pregame_decoder, core_game_decoder
+from core.routes import Routes
 
 
 # Match-state check
@@ -12,13 +14,15 @@ class MatchDetectionHandler:
         self.player_info_pre = None
         self.party_id = None
         self.user_puuid = None
+        self.routes = Routes()
 
 
-    def detect_match_handler(self):
+    def detect_match_handler(self, retry=True):
         handler = LockfileHandler()
         handler.lockfile_data_function()
 
         self.user_puuid = handler.puuid
+        self.routes = handler.routes
 
         self.match_id_header = {
             "X-Riot-ClientPlatform": "ew0KCSJwbGF0Zm9ybVR5cGUiOiAiUEMiLA0KCSJwbGF0Zm9ybU9TIjogIldpbmRvd3MiLA0KCSJwbGF0Zm9ybU9TVmVyc2lvbiI6ICIxMC4wLjE5MDQyLjEuMjU2LjY0Yml0IiwNCgkicGxhdGZvcm1DaGlwc2V0IjogIlVua25vd24iDQp9",
@@ -27,26 +31,31 @@ class MatchDetectionHandler:
             "Authorization": f"Bearer {handler.access_token}"
         }
 
-        self.pre_game_match_id_response = requests.get(
-            f"https://glz-eu-1.eu.a.pvp.net/pregame/v1/players/{handler.puuid}",
+        self.pre_game_match_id_response = http_client.get(
+            self.routes.url("pregame_player", puuid=handler.puuid),
             headers=self.match_id_header
         )
 
-        self.current_match_id_response = requests.get(
-            f"https://glz-eu-1.eu.a.pvp.net/core-game/v1/players/{handler.puuid}",
+        self.current_match_id_response = http_client.get(
+            self.routes.url("core_game_player", puuid=handler.puuid),
             headers=self.match_id_header
         )
 
+        # Cached token was revoked early (e.g. re-login), drop it and try once more with fresh credentials
+        if retry and 401 in (self.pre_game_match_id_response.status_code, self.current_match_id_response.status_code):
+            LockfileHandler.invalidate()
+            return self.detect_match_handler(retry=False)
+
         if self.current_match_id_response.status_code == 200:
-            self.current_match_id = self.current_match_id_response.json()
-            self.in_match = self.current_match_id["MatchID"]
+            self.current_match_id = player_match_decoder.decode(self.current_match_id_response.content)
+            self.in_match = self.current_match_id.match_id
         elif self.pre_game_match_id_response.status_code == 200:
-            self.pre_game_match_id = self.pre_game_match_id_response.json()
-            self.in_match = self.pre_game_match_id["MatchID"]
+            self.pre_game_match_id = player_match_decoder.decode(self.pre_game_match_id_response.content)
+            self.in_match = self.pre_game_match_id.match_id
         else:
             print("not in match")
-            self.party_id = requests.get(
-                f"https://glz-eu-1.eu.a.pvp.net/parties/v1/players/{handler.puuid}",
+            self.party_id = http_client.get(
+                self.routes.url("party_player", puuid=handler.puuid),
                 headers=self.match_id_header
             )
 
@@ -54,16 +63,16 @@ class MatchDetectionHandler:
     def player_info_retrieval(self):
         self.detect_match_handler()
         if self.current_match_id:
-            self.current_game_match_response = requests.get(
-                f"https://glz-eu-1.eu.a.pvp.net/core-game/v1/matches/{self.in_match}",
+            self.current_game_match_response = http_client.get(
+                self.routes.url("core_game_match", match_id=self.in_match),
                 headers=self.match_id_header
             )
-            self.player_info = self.current_game_match_response.json()
+            self.player_info = core_game_decoder.decode(self.current_game_match_response.content)
         elif self.pre_game_match_id:
-            self.pre_game_match_response = requests.get(
-                f"https://glz-eu-1.eu.a.pvp.net/pregame/v1/matches/{self.in_match}",
+            self.pre_game_match_response = http_client.get(
+                self.routes.url("pregame_match", match_id=self.in_match),
                 headers=self.match_id_header
             )
-            self.player_info_pre = self.pre_game_match_response.json()
+            self.player_info_pre = pregame_decoder.decode(self.pre_game_match_response.content)
         else:
             print("error")
@@ -1,7 +1,6 @@
 from core.detection import MatchDetectionHandler
+from core.http_client import http_client
 import asyncio
-import aiohttp
-import requests
 
 class dodge:
     async def dodge_func(self):
@@ -9,8 +8,9 @@ class dodge:
         await asyncio.to_thread(handler.detect_match_handler)
 
         if handler.in_match:
-            dodge_game = requests.post(
-                f"https://glz-eu-1.eu.a.pvp.net/pregame/v1/matches/{handler.in_match}/quit",
+            dodge_game = await http_client.request(
+                "POST",
+                handler.routes.url("pregame_quit", match_id=handler.in_match),
                 headers=handler.match_id_header
             )
         else:
@@ -0,0 +1,91 @@
+import time
+import asyncio
+import aiohttp
+from core.http_client import http_client
+from core.atomic_file import write_atomic
+
+DOWNLOAD_CONCURRENCY = 16   # Matches the media.valorant-api.com connection limit in http_client
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_BACKOFF = 0.5      # Seconds before the first retry, doubled after each failure
+DOWNLOAD_TIMEOUT = 15
+
+
+class DownloadStats:
+    def __init__(self):
+        self.downloaded = 0
+        self.failed = []    # URLs that still failed after every retry
+        self.gone = set()   # Paths whose URL answered with a 4xx, retrying on the next launch won't help
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def summary(self):
+        rate = self.bytes / self.elapsed / 1024 if self.elapsed else 0.0
+        return (f"{self.downloaded} downloaded, {len(self.failed)} failed, "
+                f"{self.bytes / 1024 / 1024:.1f} MB in {self.elapsed:.1f}s ({rate:.0f} KB/s)")
+
+
+class AssetDownloader:
+    """
+    Shared download pipeline for agent, rank and skin icons.
+    Goes through http_client's pooled aiohttp session with a cap on in-flight downloads,
+    retries with exponential backoff, and writes to a temp file that's renamed into place,
+    so an interrupted run never leaves a truncated PNG that looks cached.
+    """
+
+    def __init__(self, concurrency=DOWNLOAD_CONCURRENCY, retries=DOWNLOAD_RETRIES, backoff=DOWNLOAD_BACKOFF):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+
+    async def download(self, url, path, stats):
+        delay = self.backoff
+        gone = False
+        for attempt in range(self.retries + 1):
+            try:
+                response = await http_client.request("GET", url, timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT))
+                if response.status_code == 200 and response.content:
+                    await asyncio.to_thread(write_atomic, path, response.content)
+                    stats.downloaded += 1
+                    stats.bytes += len(response.content)
+                    return True
+                # 4xx other than 429 won't fix itself
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    gone = True
+                    break
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                if attempt == self.retries:
+                    print(f"⚠️ Failed to download {url}: {e}")
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        stats.failed.append(url)
+        if gone:
+            stats.gone.add(path)
+        return False
+
+    # jobs is a list of (url, path), returns DownloadStats for the run
+    async def download_all(self, jobs, label="icons"):
+        stats = DownloadStats()
+        if not jobs:
+            return stats
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def run(url, path):
+            nonlocal done
+            async with semaphore:
+                await self.download(url, path, stats)
+            done += 1
+            print(f"✔ {done}/{len(jobs)} {label}", end="\r")
+
+        print(f"🚀 Downloading {len(jobs)} {label} ({self.concurrency} at a time)...")
+        await asyncio.gather(*(run(url, path) for url, path in jobs))
+        stats.elapsed = time.perf_counter() - stats.started
+        print(f"\n📦 {label}: {stats.summary()}")
+        return stats
+
+
+asset_downloader = AssetDownloader()
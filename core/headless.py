@@ -0,0 +1,87 @@
+"""
+Headless entry point: runs ValoRank without Qt and writes frontend_data as JSON or NDJSON.
+
+    python -m core.headless                          # current lobby/match as one JSON document
+    python -m core.headless --format ndjson          # one line per player, streamed as each row is ready
+    python -m core.headless --load-more 2 -o out.json
+
+Everything the core modules print goes to stderr so stdout stays machine readable.
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+from core.api_client import ValoRank
+from core.http_client import http_client
+
+
+class RowWriter:
+    """Writes rows as NDJSON as soon as they change, or collects them for one JSON document at the end."""
+
+    def __init__(self, out, fmt):
+        self.out = out
+        self.fmt = fmt
+        self.written = {}   # PUUID → last row written, so unchanged rows aren't repeated
+        self.page = 0
+
+    def on_update(self, frontend_data):
+        if self.fmt != "ndjson":
+            return
+        for puuid, row in frontend_data.items():
+            if self.written.get(puuid) == row:
+                continue
+            self.written[puuid] = dict(row)
+            self.out.write(json.dumps({"puuid": puuid, "page": self.page, **row}, default=str) + "\n")
+        self.out.flush()
+
+    def finish(self, valo_rank):
+        if self.fmt == "ndjson":
+            self.on_update(valo_rank.frontend_data)
+            return
+        gs = valo_rank.gs or []
+        json.dump({
+            "gamemode": gs[0] if len(gs) > 0 else None,
+            "server": gs[1] if len(gs) > 1 else None,
+            "players": valo_rank.frontend_data,
+        }, self.out, indent=2, default=str)
+        self.out.write("\n")
+        self.out.flush()
+
+
+async def run(fmt, load_more, out):
+    started = time.perf_counter()
+    writer = RowWriter(out, fmt)
+    valo_rank = ValoRank()
+    try:
+        await valo_rank.valo_stats(on_update=writer.on_update)
+        for page in range(load_more):
+            writer.page = page + 1
+            await valo_rank.load_more_matches(on_update=writer.on_update)
+        # A one-shot run has no "Load More Matches" button to prefetch for
+        valo_rank.cancel_prefetch()
+        writer.finish(valo_rank)
+    finally:
+        await http_client.aclose()
+    print(f"⏱️ Finished in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json")
+    parser.add_argument("--load-more", type=int, default=0, metavar="PAGES", help="Extra pages of 10 matches to load per player")
+    parser.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            asyncio.run(run(args.format, args.load_more, out))
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
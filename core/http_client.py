@@ -0,0 +1,135 @@
+import json
+import time
+import asyncio
+import aiohttp
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from core.rate_limiter import RateLimiter
+from core.routes import host_key
+
+# Max keep-alive connections held open per host, keyed by host or by Riot service ("pd"/"glz", any shard).
+# Anything not listed uses DEFAULT_HOST_LIMIT
+HOST_LIMITS = {
+    "pd": 10,
+    "glz": 6,
+    "valorant-api.com": 4,
+    "media.valorant-api.com": 16,
+    "127.0.0.1": 2,
+}
+DEFAULT_HOST_LIMIT = 4
+RATE_LIMIT_RETRIES = 3     # Times a request is re-sent after a 429 before the 429 is handed back
+LOW_PRIORITY_HEADROOM = 0.5    # Fraction of a host's burst that must be spare before a low priority request goes out
+LOW_PRIORITY_POLL = 0.25
+
+
+class HTTPResponse:
+    """Fully read aiohttp response exposing the bits of requests.Response the app uses."""
+
+    def __init__(self, status, headers, content):
+        self.status_code = status
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HTTPClient:
+    """
+    One long-lived connection pool per host, shared by every module.
+    Sync callers go through a requests.Session, async callers through a single aiohttp.ClientSession,
+    so a refresh reuses the same TLS connections instead of handshaking on every call.
+    Every request to a Riot host is paced by the shared RateLimiter and re-sent after a 429.
+    """
+
+    def __init__(self, host_limits=None, host_rates=None, resolver=None):
+        self.host_limits = {**HOST_LIMITS, **(host_limits or {})}
+        self.resolver = resolver    # aiohttp resolver override, used by tools/bench_stat_pipeline.py
+        self.rate_limiter = RateLimiter(host_rates)
+        self.session = requests.Session()
+        self._async_session = None
+        self._semaphores = {}
+        self._mounted = set()
+        self.session.mount("https://", HTTPAdapter(pool_connections=len(self.host_limits) + 4, pool_maxsize=DEFAULT_HOST_LIMIT))
+
+    # Hosts depend on the player's shard, so their pools are mounted the first time they're used
+    def _mount_adapter(self, host):
+        if host in self._mounted:
+            return
+        self.session.mount(f"https://{host}/", HTTPAdapter(pool_connections=1, pool_maxsize=self.host_limit(host), pool_block=True))
+        self._mounted.add(host)
+
+    def set_host_limit(self, host, limit):
+        self.host_limits[host] = limit
+        self._mounted.discard(host)
+        self._semaphores.pop(host, None)
+
+    def host_limit(self, host):
+        return self.host_limits.get(host, self.host_limits.get(host_key(host), DEFAULT_HOST_LIMIT))
+
+    # Sync API (drop-in for requests.get/post/put)
+    def send(self, method, url, retries=RATE_LIMIT_RETRIES, **kwargs):
+        host = urlsplit(url).hostname
+        self._mount_adapter(host)
+        for attempt in range(retries + 1):
+            wait = self.rate_limiter.delay(host)
+            while wait:
+                time.sleep(wait)
+                wait = self.rate_limiter.pause_remaining(host)
+            response = self.session.request(method, url, **kwargs)
+            self.rate_limiter.record(host, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+        return response
+
+    def get(self, url, **kwargs):
+        return self.send("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.send("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.send("PUT", url, **kwargs)
+
+    # Async API
+    def async_session(self):
+        # Created lazily so it binds to the running (qasync) event loop
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(limit=0, keepalive_timeout=60, ttl_dns_cache=300, resolver=self.resolver)
+            self._async_session = aiohttp.ClientSession(connector=connector)
+            self._semaphores = {}
+        return self._async_session
+
+    def _semaphore(self, host):
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.host_limit(host))
+        return self._semaphores[host]
+
+    # low_priority requests (prefetching) wait until the host has spare capacity, so they never delay what the user asked for
+    async def request(self, method, url, retries=RATE_LIMIT_RETRIES, low_priority=False, **kwargs):
+        session = self.async_session()
+        host = urlsplit(url).hostname
+        for attempt in range(retries + 1):
+            while low_priority and self.rate_limiter.headroom(host) < LOW_PRIORITY_HEADROOM:
+                await asyncio.sleep(LOW_PRIORITY_POLL)
+            wait = self.rate_limiter.delay(host)
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self.rate_limiter.pause_remaining(host)
+            async with self._semaphore(host):
+                async with session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+                    result = HTTPResponse(response.status, response.headers, content)
+            self.rate_limiter.record(host, result.status_code, result.headers)
+            if result.status_code != 429:
+                break
+        return result
+
+    async def aclose(self):
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self.session.close()
+
+
+http_client = HTTPClient()
@@ -1,4 +1,4 @@
-import requests
+from core.http_client import http_client
 import time
 from core.detection import MatchDetectionHandler
 
@@ -8,16 +8,16 @@ def instalock_agent(agent_uuid):
     handler.detect_match_handler()
 
     if handler.in_match:
-        select_agent = requests.post(
-            f"https://glz-eu-1.eu.a.pvp.net/pregame/v1/matches/{handler.in_match}/select/{agent_uuid}",
+        select_agent = http_client.post(
+            handler.routes.url("pregame_select", match_id=handler.in_match, agent_uuid=agent_uuid),
             headers=handler.match_id_header
         )
 
     time.sleep(0.5)
 
     if handler.in_match:
-        lock_agent = requests.post(
-            f"https://glz-eu-1.eu.a.pvp.net/pregame/v1/matches/{handler.in_match}/lock/{agent_uuid}",
+        lock_agent = http_client.post(
+            handler.routes.url("pregame_lock", match_id=handler.in_match, agent_uuid=agent_uuid),
             headers=handler.match_id_header
         )
     else:
@@ -1,58 +1,138 @@
 import os
 import json
-import requests
+from core.http_client import http_client
+from core.routes import Routes, REGION_SHARDS, DEFAULT_REGION, region_from_sessions, region_from_locale, region_from_log
 import pathlib
 import base64
+import time
+import threading
 import urllib3
 from pathlib import Path
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+TOKEN_REFRESH_MARGIN = 120  # Seconds before the access token expires that we fetch a new one
+
 # Lockfile reading C:\Users\james\AppData\Local\Riot Games\Riot Client\Config
 
+# Reads the "exp" claim out of the access token JWT without verifying it
+def token_expiry(access_token):
+    try:
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))["exp"]
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
 class LockfileHandler:
+    # Process-wide credential cache, shared by every handler so a refresh/dodge/instalock
+    # only talks to the local client when the token is about to expire or the client restarted
+    _credentials = None
+    _credentials_lock = threading.Lock()
+
     def __init__(self):
         self.access_token = []
         self.entitlement_token = []
         self.puuid = []
         self.client_version = []
+        self.port = None
+        self.password = None
+        self.routes = Routes()
+
+    @classmethod
+    def invalidate(cls):
+        with cls._credentials_lock:
+            cls._credentials = None
 
     def lockfile_data_function(self):
         # Finds Lockfile
         lockfile_loc = rf"{os.getenv("LOCALAPPDATA")}\Riot Games\Riot Client\Config\lockfile"
         if os.path.exists(Path(rf'{lockfile_loc}')):
             lockfile_path = Path(rf'{lockfile_loc}')
+            lockfile_mtime = os.stat(lockfile_path).st_mtime
 
-            # Reads Lockfile
-            lockfile_read = open(lockfile_path, "r")
-            lockfile_data = lockfile_read.read()
-            lockfile_read.close()
+            with LockfileHandler._credentials_lock:
+                credentials = LockfileHandler._credentials
+                if (
+                    credentials is None
+                    or credentials["lockfile_mtime"] != lockfile_mtime
+                    or credentials["expires_at"] - TOKEN_REFRESH_MARGIN < time.time()
+                ):
+                    credentials = self.fetch_credentials(lockfile_path, lockfile_mtime)
+                    LockfileHandler._credentials = credentials
 
-            # Finds and defines port and password from lockfile
-            lockfile_data_colon_loc = [i for i, x in enumerate(lockfile_data) if x == ":"]
-            port = lockfile_data[lockfile_data_colon_loc[1] + 1:lockfile_data_colon_loc[2]]
-            password = lockfile_data[lockfile_data_colon_loc[2] + 1:lockfile_data_colon_loc[3]]
+            self.port = credentials["port"]
+            self.password = credentials["password"]
+            self.access_token = credentials["access_token"]
+            self.entitlement_token = credentials["entitlement_token"]
+            self.puuid = credentials["puuid"]
+            self.client_version = credentials["client_version"]
+            self.routes = credentials["routes"]
+        else:
+            print("error")
 
-            # Retrieves user's access and entitlement tokens
-            tokens_response = requests.get(
-                f"https://127.0.0.1:{port}/entitlements/v1/token",
-                auth=("riot", password),
-                verify=False
-            )
+    def fetch_credentials(self, lockfile_path, lockfile_mtime):
+        # Reads Lockfile
+        lockfile_read = open(lockfile_path, "r")
+        lockfile_data = lockfile_read.read()
+        lockfile_read.close()
 
-            # Retrives user's client version
-            session_response = requests.get(
-                f"https://127.0.0.1:{port}/product-session/v1/external-sessions",
+        # Finds and defines port and password from lockfile
+        lockfile_data_colon_loc = [i for i, x in enumerate(lockfile_data) if x == ":"]
+        port = lockfile_data[lockfile_data_colon_loc[1] + 1:lockfile_data_colon_loc[2]]
+        password = lockfile_data[lockfile_data_colon_loc[2] + 1:lockfile_data_colon_loc[3]]
+
+        # Retrieves user's access and entitlement tokens
+        tokens_response = http_client.get(
+            f"https://127.0.0.1:{port}/entitlements/v1/token",
+            auth=("riot", password),
+            verify=False
+        )
+
+        # Retrives user's client version
+        session_response = http_client.get(
+            f"https://127.0.0.1:{port}/product-session/v1/external-sessions",
+            auth=("riot", password),
+            verify=False
+        )
+
+        entitlements = tokens_response.json()
+        session = session_response.json()
+        region, shard = self.resolve_region(port, password, session)
+        print(f"🔑 Refreshed credentials from local Riot client ({region}/{shard})")
+
+        return {
+            "port": port,
+            "password": password,
+            "access_token": entitlements["accessToken"],
+            "entitlement_token": entitlements["token"],
+            "puuid": entitlements["subject"],
+            "client_version": session["host_app"]["version"],
+            "expires_at": token_expiry(entitlements["accessToken"]),
+            "lockfile_mtime": lockfile_mtime,
+            "routes": Routes(region, shard, port),
+        }
+
+    # Region/shard only changes with a new client session, so this runs alongside the token refresh.
+    # Tries the -ares-deployment launch argument, then the Riot client's region, then ShooterGame.log
+    def resolve_region(self, port, password, session):
+        region = region_from_sessions(session)
+        shard = None
+
+        if region is None:
+            locale_response = http_client.get(
+                f"https://127.0.0.1:{port}/riotclient/region-locale",
                 auth=("riot", password),
                 verify=False
             )
+            if locale_response.status_code == 200:
+                region = region_from_locale(locale_response.json())
 
-            entitlements = tokens_response.json()
-            self.access_token = entitlements["accessToken"]
-            self.entitlement_token = entitlements["token"]
-            self.puuid = entitlements["subject"]
+        if region is None:
+            region, shard = region_from_log()
 
-            session = session_response.json()
-            self.client_version = session["host_app"]["version"]
-        else:
-            print("error")
+        if region is None:
+            print(f"⚠️ Couldn't work out the region, defaulting to {DEFAULT_REGION}")
+            region = DEFAULT_REGION
+
+        return region, shard or REGION_SHARDS.get(region, REGION_SHARDS[DEFAULT_REGION])
@@ -0,0 +1,150 @@
+import json
+import base64
+import asyncio
+import aiohttp
+from core.http_client import http_client
+from core.local_api import LockfileHandler
+from core.match_watcher import MENUS, PREGAME, INGAME
+
+# WAMP-style opcodes the Riot client's websocket speaks
+SUBSCRIBE = 5
+EVENT = 8
+
+# Events that can mean our match state changed
+EVENTS = (
+    "OnJsonApiEvent_chat_v4_presences",
+    "OnJsonApiEvent_riot-messaging-service_v1_message",
+    "OnJsonApiEvent_product-session_v1_external-sessions",
+)
+# riot-messaging-service forwards these ares services' pushes, everything else (store, contracts...) is ignored
+MATCH_SERVICES = ("ares-pregame", "ares-core-game", "ares-parties")
+# Presence sessionLoopState / ares service → the match watcher's phase
+LOOP_STATES = {"MENUS": MENUS, "PREGAME": PREGAME, "INGAME": INGAME}
+SERVICE_PHASES = {"ares-pregame": PREGAME, "ares-core-game": INGAME}
+RECONNECT_DELAY = 5.0
+
+
+# True when an event is about us and could be a lobby/pregame/core-game change. Friends' presence updates are dropped
+def is_match_event(name, payload, puuid):
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if name == "OnJsonApiEvent_chat_v4_presences":
+        presences = (data or {}).get("presences") or []
+        return any(presence.get("puuid") == puuid for presence in presences)
+    if name == "OnJsonApiEvent_riot-messaging-service_v1_message":
+        if (data or {}).get("service") in MATCH_SERVICES:
+            return True
+        uri = payload.get("uri", "")
+        return any(f"/{service}/" in uri for service in MATCH_SERVICES)
+    return name in EVENTS
+
+
+# Our presence's private field is base64 JSON, sessionLoopState says whether we're in menus, agent select or a game
+def presence_phase(presence):
+    try:
+        private = json.loads(base64.b64decode(presence.get("private") or ""))
+    except (ValueError, TypeError):
+        return None
+    return LOOP_STATES.get(private.get("sessionLoopState")) if isinstance(private, dict) else None
+
+
+# (phase, match_id) an accepted event tells us without asking glz, either can be None when the event doesn't say
+def pushed_state(name, payload, puuid):
+    data = payload.get("data") if isinstance(payload, dict) else None
+    data = data if isinstance(data, dict) else {}
+    if name == "OnJsonApiEvent_chat_v4_presences":
+        for presence in data.get("presences") or []:
+            if presence.get("puuid") == puuid:
+                return presence_phase(presence), None
+        return None, None
+    if name == "OnJsonApiEvent_riot-messaging-service_v1_message":
+        resource = data.get("resource") or payload.get("uri", "")
+        service = data.get("service") or next((s for s in SERVICE_PHASES if f"/{s}/" in resource), None)
+        match_id = resource.rsplit("/matches/", 1)[1].split("/")[0] if "/matches/" in resource else None
+        return SERVICE_PHASES.get(service), match_id
+    return None, None
+
+
+class LocalEventSubscriber:
+    """
+    Optional push-based detection through the local Riot client's websocket (same port/password as the lockfile).
+    Calls on_event(name, payload, phase, match_id) whenever the client pushes something that could change
+    our match state, with whatever phase/match ID the push itself carries (see pushed_state),
+    and on_connected(True/False) so the match watcher can relax its polling while the socket is up.
+    Reconnects on its own if the client restarts. url overrides the endpoint, e.g. tools/fake_riot_client.py.
+    """
+
+    def __init__(self, on_event, on_connected=None, events=EVENTS, url=None, password=None, puuid=None):
+        self.on_event = on_event
+        self.on_connected = on_connected
+        self.events = events
+        self.url = url
+        self.password = password
+        self.puuid = puuid
+        self.connected = False
+        self.task = None
+        self.last_error = None  # Repeated failures (client closed, lockfile not written yet) are only logged once
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = None
+
+    async def endpoint(self):
+        if self.url:
+            return self.url, self.password
+        handler = LockfileHandler()
+        await asyncio.to_thread(handler.lockfile_data_function)
+        if handler.port is None:
+            return None, None
+        self.puuid = handler.puuid
+        return f"wss://127.0.0.1:{handler.port}", handler.password
+
+    def set_connected(self, connected):
+        if connected != self.connected:
+            self.connected = connected
+            if self.on_connected:
+                self.on_connected(connected)
+
+    def log_error(self, error):
+        if error != self.last_error:
+            self.last_error = error
+            print(f"⚠️ Local event stream unavailable: {error}")
+
+    async def run(self):
+        while True:
+            try:
+                url, password = await self.endpoint()
+                if url:
+                    await self.listen(url, password)
+                else:
+                    self.log_error("Riot client not running")
+            # Lockfile or entitlements not written yet, client restarting... retried either way, like the match watcher
+            except Exception as e:
+                self.log_error(f"{type(e).__name__}: {e}")
+            finally:
+                self.set_connected(False)
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def listen(self, url, password):
+        session = http_client.async_session()
+        async with session.ws_connect(url, auth=aiohttp.BasicAuth("riot", password), ssl=False, heartbeat=30) as ws:
+            for event in self.events:
+                await ws.send_json([SUBSCRIBE, event])
+            self.set_connected(True)
+            self.last_error = None
+            print(f"📡 Subscribed to {len(self.events)} local client events")
+
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT or not message.data:
+                    continue
+                try:
+                    opcode, name, payload = json.loads(message.data)
+                except (ValueError, TypeError):
+                    continue
+                if opcode == EVENT and is_match_event(name, payload, self.puuid):
+                    phase, match_id = pushed_state(name, payload, self.puuid)
+                    self.on_event(name, payload, phase, match_id)
@@ -0,0 +1,96 @@
+import os
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from core.atomic_file import write_atomic
+
+CACHE_DIR = "cache/matches"
+MAX_CACHE_BYTES = 256 * 1024 * 1024   # Compressed size cap before least recently used matches are evicted
+
+
+class MatchCache:
+    """
+    Persistent store of finished /match-details payloads.
+    Entries are zlib-compressed, addressed by a hash of the MatchID and evicted least-recently-used first
+    once the cache grows past max_bytes. Match details never change after a match ends, so entries never expire.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index = OrderedDict()  # path → compressed size, least recently used first
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.load_index()
+
+    def load_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, path, stat.st_size))
+
+        # mtime doubles as "last used" since reads touch the file
+        for _, path, size in sorted(entries):
+            self.index[path] = size
+            self.total_bytes += size
+
+    def path_for(self, match_id):
+        digest = hashlib.sha1(match_id.lower().encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json.z")
+
+    # Index lookup only, doesn't touch the file
+    def __contains__(self, match_id):
+        with self.lock:
+            return self.path_for(match_id) in self.index
+
+    def get(self, match_id):
+        path = self.path_for(match_id)
+        with self.lock:
+            if path not in self.index:
+                return None
+            self.index.move_to_end(path)
+
+        try:
+            with open(path, "rb") as f:
+                content = zlib.decompress(f.read())
+            os.utime(path)
+            return content
+        except (OSError, zlib.error):
+            self.discard(path)
+            return None
+
+    def put(self, match_id, content):
+        path = self.path_for(match_id)
+        data = zlib.compress(content, 6)
+
+        write_atomic(path, data)
+
+        with self.lock:
+            self.total_bytes += len(data) - self.index.pop(path, 0)
+            self.index[path] = len(data)
+            self.evict()
+
+    def discard(self, path):
+        with self.lock:
+            self.total_bytes -= self.index.pop(path, 0)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self):
+        # Caller holds self.lock
+        while self.total_bytes > self.max_bytes and len(self.index) > 1:
+            path, size = self.index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
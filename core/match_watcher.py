@@ -0,0 +1,160 @@
+import asyncio
+from core.detection import MatchDetectionHandler
+
+MENUS = "menus"
+PREGAME = "pregame"
+INGAME = "ingame"
+
+# Seconds between polls in each phase, agent select changes by the second while menus and live games barely change
+POLL_INTERVALS = {
+    MENUS: 5.0,
+    PREGAME: 1.0,
+    INGAME: 15.0,
+}
+ERROR_INTERVAL = 10.0   # Riot client closed or not logged in yet
+EVENT_FALLBACK_INTERVAL = 60.0  # Safety poll while the local event stream is pushing changes to us
+EVENT_COALESCE_DELAY = 0.5      # Agent select pushes arrive in bursts (every hover/lock), one poll answers the lot
+
+# Transitions handed to on_transition
+MATCH_FOUND = "match_found"         # Menus → pregame/core-game, or straight into a different match
+MATCH_STARTED = "match_started"     # Pregame → core-game in the same match, the enemy team is now visible
+AGENTS_CHANGED = "agents_changed"   # Someone hovered or locked a different agent in pregame
+MATCH_ENDED = "match_ended"         # Back in the menus
+
+
+class MatchSnapshot:
+    """The parts of the match state the window reacts to, compared poll to poll."""
+
+    def __init__(self, phase=MENUS, match_id=None, agents=None):
+        self.phase = phase
+        self.match_id = match_id
+        self.agents = agents or {}     # PUUID → agent UUID
+
+    @classmethod
+    def from_handler(cls, handler):
+        if handler.player_info:
+            agents = {player.subject: player.character_id for player in handler.player_info.players or []}
+            return cls(INGAME, handler.in_match, agents)
+        if handler.player_info_pre and handler.player_info_pre.ally_team:
+            agents = {player.subject: player.character_id for player in handler.player_info_pre.ally_team.players or []}
+            return cls(PREGAME, handler.in_match, agents)
+        return cls()
+
+    def __eq__(self, other):
+        return (self.phase, self.match_id, self.agents) == (other.phase, other.match_id, other.agents)
+
+    def __repr__(self):
+        return f"MatchSnapshot({self.phase}, {self.match_id})"
+
+
+# Works out what changed between two snapshots, only the transitions that need work are returned
+def diff_snapshots(previous, current):
+    if previous == current:
+        return []
+
+    if current.phase == MENUS:
+        return [MATCH_ENDED] if previous.phase != MENUS else []
+
+    if current.match_id != previous.match_id:
+        return [MATCH_FOUND]
+
+    if previous.phase == PREGAME and current.phase == INGAME:
+        return [MATCH_STARTED]
+
+    if current.agents != previous.agents:
+        return [AGENTS_CHANGED]
+
+    return []
+
+
+class MatchWatcher:
+    """
+    Background poller for presence, pregame and core-game.
+    Polls fast during agent select and slowly everywhere else, diffs each snapshot against the last one,
+    and calls on_transition(transition, previous, current, handler) only when something actually changed.
+    If on_transition returns False (e.g. a refresh was already running) the transition is retried next poll.
+    While the local event stream is connected the timed polls back off, and glz is only asked again when a push
+    says our phase or match changed or our pregame/core-game was updated. Bursts of pushes share one poll.
+    """
+
+    def __init__(self, on_transition, intervals=None):
+        self.on_transition = on_transition
+        self.intervals = {**POLL_INTERVALS, **(intervals or {})}
+        self.previous = MatchSnapshot()
+        self.task = None
+        self.event_driven = False   # Set while a LocalEventSubscriber is connected
+        self.wake_event = asyncio.Event()
+        self.woken_by_event = False
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = None
+
+    # Polls straight away instead of waiting out the interval
+    def wake(self, *args):
+        self.wake_event.set()
+
+    # LocalEventSubscriber callback. Presence and party pushes that don't move us to another phase
+    # are answered from what we already know, only real changes cost a round of glz requests
+    def push(self, name, payload, phase=None, match_id=None):
+        if match_id is not None:
+            # A pregame/core-game resource: a new match, or ours changed (agent hover/lock, loading in)
+            changed = True
+        elif phase is not None:
+            changed = phase != self.previous.phase
+        else:
+            # Party pushes never change the match on their own, presence that wouldn't decode
+            # and external-sessions are rare enough to just check
+            changed = name != "OnJsonApiEvent_riot-messaging-service_v1_message"
+        if changed:
+            self.woken_by_event = True
+            self.wake()
+
+    def set_event_driven(self, event_driven):
+        self.event_driven = event_driven
+        self.wake()
+
+    async def sleep(self, interval):
+        try:
+            await asyncio.wait_for(self.wake_event.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        # Let the rest of a burst land before polling, everything that arrives meanwhile is folded into this poll
+        if self.woken_by_event:
+            await asyncio.sleep(EVENT_COALESCE_DELAY)
+        self.woken_by_event = False
+        self.wake_event.clear()
+
+    async def poll(self):
+        handler = MatchDetectionHandler()
+        await asyncio.to_thread(handler.player_info_retrieval)
+        return handler, MatchSnapshot.from_handler(handler)
+
+    async def run(self):
+        while True:
+            try:
+                handler, current = await self.poll()
+            except Exception as e:
+                print(f"⚠️ Match watcher poll failed: {e}")
+                await self.sleep(ERROR_INTERVAL)
+                continue
+
+            handled = True
+            try:
+                for transition in diff_snapshots(self.previous, current):
+                    print(f"👀 {transition}: {self.previous} → {current}")
+                    if await self.on_transition(transition, self.previous, current, handler) is False:
+                        handled = False
+            # A refresh that blew up (network, bad payload...) is retried next poll instead of ending the watcher
+            except Exception as e:
+                print(f"⚠️ Match watcher transition failed: {e}")
+                handled = False
+            if handled:
+                self.previous = current
+
+            await self.sleep(EVENT_FALLBACK_INTERVAL if self.event_driven else self.intervals[current.phase])
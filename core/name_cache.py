@@ -0,0 +1,52 @@
+import json
+import time
+import threading
+from core.atomic_file import write_atomic
+
+CACHE_PATH = "cache/names.json"
+NAME_TTL = 7 * 24 * 60 * 60     # Re-resolve a name through name-service after a week even if we never saw it change
+
+
+class NameCache:
+    """
+    PUUID → Riot ID cache that survives restarts.
+    Entries are overwritten whenever a newer name is seen (name-service or match details),
+    so a renamed player is picked up the next time they show up in a match.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=NAME_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.names = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.names = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.names = {}
+
+    def get(self, puuid):
+        entry = self.names.get(puuid)
+        if entry is None or time.time() - entry["updated"] > self.ttl:
+            return None
+        return f"{entry['game_name']}#{entry['tag_line']}"
+
+    def update(self, puuid, game_name, tag_line):
+        if not game_name:
+            return
+        with self.lock:
+            self.names[puuid] = {"game_name": game_name, "tag_line": tag_line, "updated": time.time()}
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            snapshot = json.dumps(self.names)
+            self.dirty = False
+
+        write_atomic(self.path, snapshot)
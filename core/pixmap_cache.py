@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from core.asset_pack import load_pixmap
+
+MAX_PIXMAP_BYTES = 64 * 1024 * 1024    # Decoded skin images kept in memory, a popup needs at most 19
+
+
+class SkinPixmapCache:
+    """
+    Skin/chroma UUID → QPixmap, decoded from disk the first time a popup asks for it.
+    Only the most recently shown images are kept, bounded by their decoded size rather than their count.
+    Exposes .get() so it drops in where the old {uuid: QPixmap} dict was used.
+    Given an AssetPack, paths maps each UUID to its name in the pack's "skins" section instead of a file.
+    """
+
+    def __init__(self, paths, max_bytes=MAX_PIXMAP_BYTES, pack=None):
+        self.paths = {str(uuid).lower(): path for uuid, path in paths.items()}
+        self.max_bytes = max_bytes
+        self.pack = pack
+        self.pixmaps = OrderedDict()    # uuid → (QPixmap, bytes), least recently used first
+        self.bytes = 0
+
+    @classmethod
+    def from_pack(cls, pack, max_bytes=MAX_PIXMAP_BYTES):
+        return cls({name: name for name in pack.section("skins")}, max_bytes, pack)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, uuid):
+        return str(uuid).lower() in self.paths
+
+    def get(self, uuid, default=None):
+        key = str(uuid).lower()
+        entry = self.pixmaps.get(key)
+        if entry is not None:
+            self.pixmaps.move_to_end(key)
+            return entry[0]
+
+        path = self.paths.get(key)
+        if path is None:
+            return default
+
+        # Imported here so core stays importable without Qt
+        from PySide6.QtGui import QPixmap
+        if self.pack is not None:
+            pixmap = load_pixmap(self.pack.get("skins", path))
+        else:
+            pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return default
+
+        size = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self.pixmaps[key] = (pixmap, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self.pixmaps) > 1:
+            _, (_, evicted) = self.pixmaps.popitem(last=False)
+            self.bytes -= evicted
+        return pixmap
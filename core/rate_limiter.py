@@ -0,0 +1,127 @@
+import time
+import threading
+from core.routes import host_key
+
+# Starting (requests/second, burst) per Riot host, keyed by host or by service ("pd"/"glz", any shard).
+# The burst covers a whole 10-player refresh (~70 pd requests) so a cold refresh never waits on the bucket,
+# only a 429 from Riot brings the rate down (halved, then climbing back on each success).
+HOST_RATES = {
+    "pd": (20.0, 80),
+    "glz": (10.0, 20),
+}
+DEFAULT_RATE = 10.0
+MIN_RATE = 1.0
+MAX_RATE = 40.0
+BURST = 10
+RATE_INCREASE = 0.25     # Added to the rate after every successful request
+RATE_DECREASE = 0.5      # Multiplier applied to the rate on a 429
+DEFAULT_RETRY_AFTER = 2
+
+
+def is_rate_limited_host(host):
+    return host is not None and host.endswith(".pvp.net")
+
+
+def parse_retry_after(headers):
+    try:
+        return max(0.0, float(headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every sync and async caller for one host.
+    Callers reserve a token up front and are told how long to wait, so queued requests go out evenly
+    instead of all at once. A 429 pauses the whole bucket for Retry-After and halves the rate,
+    each success nudges the rate back up (AIMD).
+    """
+
+    def __init__(self, rate, burst=BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            # self.updated sits in the future while the bucket is paused by a Retry-After
+            if now > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+
+            wait = max(0.0, self.updated - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    # Tokens that could be spent right now without waiting, background work only goes out while this is high
+    def available(self):
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return 0.0
+            return min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+
+    # Requests that were already queued when a 429 came in check this after their wait and hold off again
+    def pause_remaining(self):
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(MAX_RATE, self.rate + RATE_INCREASE)
+
+    def on_rate_limited(self, retry_after):
+        with self.lock:
+            now = time.monotonic()
+            # Requests in flight when the limit hit all come back 429, only the first one of the wall halves the rate
+            if now >= self.paused_until:
+                self.rate = max(MIN_RATE, self.rate * RATE_DECREASE)
+            self.tokens = min(self.tokens, 0)
+            self.paused_until = max(self.paused_until, now + retry_after)
+            self.updated = max(self.updated, self.paused_until)
+
+
+class RateLimiter:
+    def __init__(self, host_rates=None):
+        self.host_rates = {**HOST_RATES, **(host_rates or {})}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, host):
+        if not is_rate_limited_host(host):
+            return None
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.host_rates.get(host, self.host_rates.get(host_key(host), (DEFAULT_RATE, BURST)))
+                self.buckets[host] = TokenBucket(rate, burst)
+            return self.buckets[host]
+
+    # Seconds the caller has to wait before sending its request to host
+    def delay(self, host):
+        bucket = self.bucket(host)
+        return bucket.reserve() if bucket else 0.0
+
+    # Fraction of the host's burst that's spare right now, 1.0 for hosts that aren't rate limited
+    def headroom(self, host):
+        bucket = self.bucket(host)
+        return bucket.available() / bucket.capacity if bucket else 1.0
+
+    def pause_remaining(self, host):
+        bucket = self.bucket(host)
+        return bucket.pause_remaining() if bucket else 0.0
+
+    def record(self, host, status, headers):
+        bucket = self.bucket(host)
+        if bucket is None:
+            return
+        if status == 429:
+            retry_after = parse_retry_after(headers)
+            bucket.on_rate_limited(retry_after)
+            print(f"🚫 Rate limited by {host} (429). Pausing for {retry_after}s, rate now {bucket.rate:.1f}/s")
+        else:
+            bucket.on_success()
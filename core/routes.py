@@ -0,0 +1,120 @@
+import os
+import re
+
+# Region → shard the region's PD/GLZ servers live on
+REGION_SHARDS = {
+    "na": "na",
+    "latam": "na",
+    "br": "na",
+    "eu": "eu",
+    "ap": "ap",
+    "kr": "kr",
+    "pbe": "pbe",
+}
+DEFAULT_REGION = "eu"
+
+# Riot client region codes (/riotclient/region-locale) → Valorant region
+CLIENT_REGIONS = {
+    "na": "na", "na1": "na", "pbe": "pbe", "pbe1": "pbe",
+    "la1": "latam", "la2": "latam", "lan": "latam", "las": "latam", "latam": "latam",
+    "br": "br", "br1": "br",
+    "eu": "eu", "euw": "eu", "euw1": "eu", "eune": "eu", "eun1": "eu", "tr": "eu", "tr1": "eu", "ru": "eu", "me1": "eu",
+    "ap": "ap", "oc1": "ap", "jp": "ap", "jp1": "ap", "sg2": "ap", "tw2": "ap", "vn2": "ap", "th2": "ap", "ph2": "ap",
+    "kr": "kr",
+}
+
+# Every Riot endpoint the app calls, by service: "pd" (player data), "glz" (game lobby) or "local" (Riot client)
+ROUTES = {
+    "match_details": ("pd", "/match-details/v1/matches/{match_id}"),
+    "match_history": ("pd", "/match-history/v1/history/{puuid}"),
+    "mmr": ("pd", "/mmr/v1/players/{puuid}"),
+    "name_service": ("pd", "/name-service/v2/players"),
+    "pregame_player": ("glz", "/pregame/v1/players/{puuid}"),
+    "pregame_match": ("glz", "/pregame/v1/matches/{match_id}"),
+    "pregame_loadouts": ("glz", "/pregame/v1/matches/{match_id}/loadouts"),
+    "pregame_select": ("glz", "/pregame/v1/matches/{match_id}/select/{agent_uuid}"),
+    "pregame_lock": ("glz", "/pregame/v1/matches/{match_id}/lock/{agent_uuid}"),
+    "pregame_quit": ("glz", "/pregame/v1/matches/{match_id}/quit"),
+    "core_game_player": ("glz", "/core-game/v1/players/{puuid}"),
+    "core_game_match": ("glz", "/core-game/v1/matches/{match_id}"),
+    "core_game_loadouts": ("glz", "/core-game/v1/matches/{match_id}/loadouts"),
+    "party_player": ("glz", "/parties/v1/players/{puuid}"),
+    "party": ("glz", "/parties/v1/parties/{party_id}"),
+}
+
+ARES_DEPLOYMENT = re.compile(r"-ares-deployment=(\w+)")
+SHOOTER_GAME_HOST = re.compile(r"https://glz-(\w+)-1\.(\w+)\.a\.pvp\.net")
+
+
+def pd_host(shard):
+    return f"pd.{shard}.a.pvp.net"
+
+
+def glz_host(region, shard):
+    return f"glz-{region}-1.{shard}.a.pvp.net"
+
+
+# Groups every shard's hosts under one key so per-host limits and rates can be configured once ("pd", "glz")
+def host_key(host):
+    if host and host.endswith(".a.pvp.net"):
+        if host.startswith("pd."):
+            return "pd"
+        if host.startswith("glz-"):
+            return "glz"
+    return host
+
+
+# Region from the -ares-deployment launch argument in /product-session/v1/external-sessions
+def region_from_sessions(sessions):
+    for session in (sessions or {}).values():
+        try:
+            arguments = session["launchConfiguration"]["arguments"]
+        except (KeyError, TypeError):
+            continue
+        for argument in arguments or []:
+            match = ARES_DEPLOYMENT.search(argument)
+            if match and match.group(1).lower() in REGION_SHARDS:
+                return match.group(1).lower()
+    return None
+
+
+# Region from /riotclient/region-locale
+def region_from_locale(region_locale):
+    try:
+        return CLIENT_REGIONS.get(region_locale["region"].lower())
+    except (KeyError, TypeError, AttributeError):
+        return None
+
+
+# (region, shard) from the last GLZ host the game logged, used when the Riot client doesn't tell us
+def region_from_log(log_path=None):
+    log_path = log_path or rf"{os.getenv('LOCALAPPDATA')}\VALORANT\Saved\Logs\ShooterGame.log"
+    try:
+        with open(log_path, encoding="utf-8", errors="ignore") as f:
+            matches = SHOOTER_GAME_HOST.findall(f.read())
+    except OSError:
+        return None, None
+    if not matches:
+        return None, None
+    return matches[-1]
+
+
+class Routes:
+    """Builds every endpoint URL for one region/shard, resolved once per Riot client session."""
+
+    def __init__(self, region=DEFAULT_REGION, shard=None, port=None):
+        self.region = region
+        self.shard = shard or REGION_SHARDS.get(region, REGION_SHARDS[DEFAULT_REGION])
+        self.port = port
+        self.hosts = {
+            "pd": pd_host(self.shard),
+            "glz": glz_host(self.region, self.shard),
+            "local": f"127.0.0.1:{port}",
+        }
+
+    def url(self, name, **params):
+        service, path = ROUTES[name]
+        return f"https://{self.hosts[service]}{path.format(**params)}"
+
+    def __repr__(self):
+        return f"Routes(region={self.region!r}, shard={self.shard!r})"
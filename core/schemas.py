@@ -0,0 +1,136 @@
+import msgspec
+
+# Typed views of the Riot API responses the app reads.
+# Only the fields calc_stats, gs_func and the frontend use are declared, msgspec skips everything else
+# (kill events, economy, ability casts...) while decoding instead of building dicts for it.
+
+
+# /match-details/v1/matches/{match_id}
+class Damage(msgspec.Struct):
+    legshots: int = 0
+    bodyshots: int = 0
+    headshots: int = 0
+
+
+class RoundPlayerStats(msgspec.Struct, rename="camel"):
+    subject: str
+    damage: list[Damage] | None = None
+
+
+class RoundResult(msgspec.Struct, rename="camel"):
+    player_stats: list[RoundPlayerStats] | None = None
+
+
+class PlayerStats(msgspec.Struct, rename="camel"):
+    score: int = 0
+    rounds_played: int = 0
+    kills: int = 0
+    deaths: int = 0
+
+
+class MatchPlayer(msgspec.Struct, rename="camel"):
+    subject: str
+    game_name: str = ""
+    tag_line: str = ""
+    team_id: str = ""
+    account_level: int = 0
+    stats: PlayerStats | None = None
+
+
+class MatchTeam(msgspec.Struct, rename="camel"):
+    team_id: str
+    won: bool = False
+
+
+class MatchInfo(msgspec.Struct, rename="camel"):
+    match_id: str = ""
+    is_completed: bool = False
+
+
+class MatchDetails(msgspec.Struct, rename="camel"):
+    match_info: MatchInfo
+    players: list[MatchPlayer] | None = None
+    teams: list[MatchTeam] | None = None
+    round_results: list[RoundResult] | None = None
+
+
+# /match-history/v1/history/{puuid}
+class HistoryEntry(msgspec.Struct):
+    match_id: str = msgspec.field(name="MatchID")
+
+
+class MatchHistory(msgspec.Struct, rename="pascal"):
+    total: int = 0
+    history: list[HistoryEntry] | None = None
+
+
+# /mmr/v1/players/{puuid}
+class CompetitiveUpdate(msgspec.Struct, rename="pascal"):
+    tier_after_update: int = 0
+    ranked_rating_after_update: int = 0
+
+
+class SeasonalInfo(msgspec.Struct, rename="pascal"):
+    wins_by_tier: dict[str, int] | None = None
+
+
+class QueueSkill(msgspec.Struct):
+    seasonal_info_by_season_id: dict[str, SeasonalInfo] | None = msgspec.field(default=None, name="SeasonalInfoBySeasonID")
+
+
+class PlayerMMR(msgspec.Struct, rename="pascal"):
+    latest_competitive_update: CompetitiveUpdate | None = None
+    queue_skills: dict[str, QueueSkill] | None = None
+
+
+# /pregame/v1/players/{puuid} and /core-game/v1/players/{puuid}
+class PlayerMatch(msgspec.Struct):
+    match_id: str = msgspec.field(name="MatchID")
+
+
+# /pregame/v1/matches/{match_id}
+class PlayerIdentity(msgspec.Struct):
+    account_level: int = msgspec.field(default=0, name="AccountLevel")
+
+
+class PregamePlayer(msgspec.Struct):
+    subject: str = msgspec.field(name="Subject")
+    character_id: str = msgspec.field(default="", name="CharacterID")
+    identity: PlayerIdentity | None = msgspec.field(default=None, name="PlayerIdentity")
+
+
+class PregameTeam(msgspec.Struct):
+    team_id: str = msgspec.field(name="TeamID")
+    players: list[PregamePlayer] | None = msgspec.field(default=None, name="Players")
+
+
+class PregameMatch(msgspec.Struct):
+    match_id: str = msgspec.field(default="", name="ID")
+    ally_team: PregameTeam | None = msgspec.field(default=None, name="AllyTeam")
+    teams: list[PregameTeam] | None = msgspec.field(default=None, name="Teams")
+    mode: str = msgspec.field(default="", name="Mode")
+    game_pod_id: str = msgspec.field(default="", name="GamePodID")
+    is_ranked: bool | int = msgspec.field(default=True, name="IsRanked")
+
+
+# /core-game/v1/matches/{match_id}
+class CoreGamePlayer(msgspec.Struct):
+    subject: str = msgspec.field(name="Subject")
+    team_id: str = msgspec.field(default="", name="TeamID")
+    character_id: str = msgspec.field(default="", name="CharacterID")
+    identity: PlayerIdentity | None = msgspec.field(default=None, name="PlayerIdentity")
+
+
+class CoreGameMatch(msgspec.Struct):
+    match_id: str = msgspec.field(name="MatchID")
+    players: list[CoreGamePlayer] | None = msgspec.field(default=None, name="Players")
+    mode_id: str = msgspec.field(default="", name="ModeID")
+    game_pod_id: str = msgspec.field(default="", name="GamePodID")
+
+
+match_details_decoder = msgspec.json.Decoder(MatchDetails)
+match_history_decoder = msgspec.json.Decoder(MatchHistory)
+mmr_decoder = msgspec.json.Decoder(PlayerMMR)
+player_match_decoder = msgspec.json.Decoder(PlayerMatch)
+pregame_decoder = msgspec.json.Decoder(PregameMatch)
+core_game_decoder = msgspec.json.Decoder(CoreGameMatch)
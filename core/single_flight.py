@@ -0,0 +1,21 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one in-flight task.
+    Every caller that arrives while the task is running awaits the same future and gets the same result.
+    """
+
+    def __init__(self):
+        self.in_flight = {}
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+
+        # Shielded so one player's task being cancelled doesn't cancel the fetch for everyone else
+        return await asyncio.shield(future)
@@ -1,4 +1,4 @@
-import requests
+from core.http_client import http_client
 from core.valorant_uuid import UUIDHandler
 
 class SkinHandler:
@@ -7,20 +7,23 @@ class SkinHandler:
         self.uuid_handler.skin_uuid_function()
         self.converted_skins = {}
         self.skins = None
+        self.skins_pre = None
 
-    def get_skins(self, match_uuid, match_id_header):
-        self.skins = requests.get(
-            f"https://glz-eu-1.eu.a.pvp.net/core-game/v1/matches/{match_uuid}/loadouts",
+    async def get_skins(self, match_uuid, match_id_header, routes):
+        self.skins = (await http_client.request(
+            "GET",
+            routes.url("core_game_loadouts", match_id=match_uuid),
             headers=match_id_header
-        ).json()
+        )).json()
 
         try:
             if self.skins["httpStatus"] != 200:
                 self.skins = False
-                self.skins_pre = requests.get(
-                    f"https://glz-eu-1.eu.a.pvp.net/pregame/v1/matches/{match_uuid}/loadouts",
+                self.skins_pre = (await http_client.request(
+                    "GET",
+                    routes.url("pregame_loadouts", match_id=match_uuid),
                     headers=match_id_header
-                ).json()
+                )).json()
         except KeyError:
             pass
 
@@ -41,9 +44,8 @@ class SkinHandler:
 
         self.converted_skins[puuid] = skin_uuids
 
-    def assign_skins(self, puuid, match_uuid, match_id_header):
-        if not self.skins:
-            self.get_skins(match_uuid, match_id_header)
+    # Loadouts have to be loaded with get_skins first
+    def assign_skins(self, puuid):
         self.convert_skins(puuid)
         return {
             "Classic": self.converted_skins[puuid][1],
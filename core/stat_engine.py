@@ -0,0 +1,152 @@
+import math
+import numpy as np
+from collections import OrderedDict
+
+# One row per player per match, every stat calc_stats shows is a column reduction over these
+MATCH_DTYPE = np.dtype([
+    ("won", np.bool_),
+    ("score", np.int32),
+    ("rounds", np.int32),
+    ("kills", np.int32),
+    ("deaths", np.int32),
+    ("headshots", np.int32),
+    ("bodyshots", np.int32),
+    ("legshots", np.int32),
+])
+SUM_FIELDS = ("score", "rounds", "kills", "deaths", "headshots", "bodyshots", "legshots")
+MAX_SUMMARIES = 5000     # Match summaries kept in memory, a few hundred bytes each
+
+
+class MatchSummary:
+    """
+    One match reduced to a row per participant, built once when the match is fetched.
+    Every player in the lobby (and in later lobbies) that played the match reads their row from here
+    instead of walking the match details again.
+    """
+
+    def __init__(self, match_id, players, rows):
+        self.match_id = match_id
+        self.players = players      # MatchPlayer per row, has the name/tag/level as of this match
+        self.rows = rows
+        self.slots = {player.subject: i for i, player in enumerate(players)}
+
+    @classmethod
+    def from_details(cls, match_id, match):
+        players = [player for player in match.players or [] if player.stats is not None]
+        slots = {player.subject: i for i, player in enumerate(players)}
+        won_by_team = {team.team_id: team.won for team in match.teams or []}
+
+        # Summed as plain ints, writing single NumPy elements in this loop costs several times more
+        shots = [[0, 0, 0] for _ in players]    # head, body, leg
+        for round in match.round_results or []:
+            for stats in round.player_stats or []:
+                slot = slots.get(stats.subject)
+                if slot is None:
+                    continue
+                totals = shots[slot]
+                for damage in stats.damage or []:
+                    totals[0] += damage.headshots
+                    totals[1] += damage.bodyshots
+                    totals[2] += damage.legshots
+
+        rows = np.array([
+            (won_by_team.get(player.team_id, False), player.stats.score, player.stats.rounds_played,
+             player.stats.kills, player.stats.deaths, *shots[i])
+            for i, player in enumerate(players)
+        ], dtype=MATCH_DTYPE)
+
+        return cls(match_id, players, rows)
+
+    def slot(self, puuid):
+        return self.slots.get(puuid)
+
+    def player(self, puuid):
+        slot = self.slots.get(puuid)
+        return self.players[slot] if slot is not None else None
+
+
+class MatchSummaryIndex:
+    """
+    (match ID, PUUID) → row lookup over every match summarised this session, least recently used dropped first.
+    Kept for the lifetime of the app so premades and players met again in a later lobby reuse the same summaries.
+    """
+
+    def __init__(self, max_matches=MAX_SUMMARIES):
+        self.max_matches = max_matches
+        self.summaries = OrderedDict()
+
+    def get(self, match_id):
+        summary = self.summaries.get(match_id)
+        if summary is not None:
+            self.summaries.move_to_end(match_id)
+        return summary
+
+    def add(self, summary):
+        self.summaries[summary.match_id] = summary
+        self.summaries.move_to_end(summary.match_id)
+        while len(self.summaries) > self.max_matches:
+            self.summaries.popitem(last=False)
+
+
+class PlayerStatColumns:
+    """
+    Columnar view of one page of a player's match history.
+    Gathered from the player's row in each match summary, the totals RunningStats keeps are plain NumPy reductions over it.
+    """
+
+    def __init__(self, puuid, summaries):
+        self.puuid = puuid
+        self.player = None      # MatchPlayer from the most recent match, has the current name/tag/level
+        rows = []
+        for summary in summaries:
+            # None when the match failed to load
+            slot = summary.slot(puuid) if summary is not None else None
+            if slot is None:
+                continue
+            rows.append(summary.rows[slot])
+            if self.player is None:
+                self.player = summary.players[slot]
+        self.columns = np.array(rows, dtype=MATCH_DTYPE)
+
+    def __len__(self):
+        return len(self.columns)
+
+    # Column sums in SUM_FIELDS order
+    def totals(self):
+        return np.array([self.columns[field].sum() for field in SUM_FIELDS], dtype=np.int64)
+
+
+class RunningStats:
+    """
+    Running totals for one player.
+    Each page of matches is folded in once, so loading more matches only costs the new page
+    no matter how far back we've already gone.
+    """
+
+    def __init__(self):
+        self.matches = 0
+        self.wins = 0
+        self.totals = np.zeros(len(SUM_FIELDS), dtype=np.int64)
+        self.player = None      # From the newest match folded in, pages are loaded newest first
+
+    def fold(self, columns):
+        self.matches += len(columns)
+        self.wins += int(np.count_nonzero(columns.columns["won"]))
+        self.totals += columns.totals()
+        if self.player is None:
+            self.player = columns.player
+
+    def summary(self):
+        if self.matches == 0:
+            return None
+
+        score, rounds, kills, deaths, headshots, bodyshots, legshots = (int(total) for total in self.totals)
+        shots = headshots + bodyshots + legshots
+
+        return {
+            "matches": self.matches,
+            "wl": math.floor(self.wins / self.matches * 100),
+            "acs": score / rounds if rounds else 0.0,
+            "kd": kills / max(deaths, 1),
+            "hs": headshots / shots * 100 if shots else 0.0,
+        }
@@ -0,0 +1,71 @@
+import os
+import re
+import shutil
+from collections import OrderedDict
+from core.atomic_file import atomic_path
+
+THUMBNAIL_DIR = "cache/thumbnails"
+MAX_THUMBNAILS = 1024    # Scaled pixmaps kept in memory, a 120x70 skin preview is ~33 KB
+
+
+class ThumbnailCache:
+    """
+    (section, name, width, height) → QPixmap already smooth-scaled to that size.
+    Each icon is scaled once per size and saved under cache/thumbnails/<content version>/, so
+    rebuilding the player cards on a refresh, or the next launch, reuses the same thumbnails.
+    Thumbnails from older content versions are deleted when the cache is created.
+    """
+
+    def __init__(self, version, root=THUMBNAIL_DIR, max_entries=MAX_THUMBNAILS):
+        self.dir = os.path.join(root, safe_name(str(version)))
+        self.max_entries = max_entries
+        self.pixmaps = OrderedDict()    # key → QPixmap, least recently used first
+        self.prune(root)
+
+    def prune(self, root):
+        if not os.path.isdir(root):
+            return
+        for entry in os.listdir(root):
+            path = os.path.join(root, entry)
+            if path != self.dir and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def path(self, section, name, width, height):
+        return os.path.join(self.dir, section, f"{width}x{height}", f"{safe_name(name)}.png")
+
+    # icons is the full size {name: QPixmap} mapping (or SkinPixmapCache), only read on a miss
+    def get(self, section, icons, name, width, height=None):
+        height = height or width
+        key = (section, name, width, height)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+
+        # Imported here so core stays importable without Qt
+        from PySide6.QtCore import Qt
+        from PySide6.QtGui import QPixmap
+
+        path = self.path(section, name, width, height)
+        pixmap = QPixmap(path) if os.path.exists(path) else None
+        if pixmap is None or pixmap.isNull():
+            source = icons.get(name)
+            if not source:
+                return None
+            pixmap = source.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            try:
+                with atomic_path(path) as tmp_path:
+                    if not pixmap.save(tmp_path, "PNG"):
+                        raise OSError("QPixmap.save failed")
+            except OSError as e:
+                print(f"⚠️ Couldn't save thumbnail {path}: {e}")
+
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.max_entries:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+
+# Agent names like KAY/O aren't valid file names
+def safe_name(name):
+    return re.sub(r'[\\/*?:"<>|]', "_", name)
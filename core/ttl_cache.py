@@ -0,0 +1,42 @@
+import time
+from collections import OrderedDict
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+class TTLCache:
+    """
+    In-memory cache whose entries are fresh for ttl seconds and can then be served stale for up to
+    stale_ttl more seconds while the caller refreshes them in the background.
+    """
+
+    def __init__(self, ttl, stale_ttl=0, max_entries=1000):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()    # key → (value, stored_at), least recently used first
+
+    # Returns (value, FRESH/STALE), or (None, None) when there's nothing usable
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, None
+
+        value, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            del self.entries[key]
+            return None, None
+
+        self.entries.move_to_end(key)
+        return value, FRESH if age <= self.ttl else STALE
+
+    def set(self, key, value):
+        self.entries[key] = (value, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self.entries.pop(key, None)
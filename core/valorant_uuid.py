@@ -1,9 +1,14 @@
-import requests
+from core.http_client import http_client
+from core.atomic_file import write_atomic
 import json
+import threading
 
 class UUIDHandler:
     def __init__(self):
         self.agent_uuid_request = None
+        self.season_index = None
+        self.season_index_refreshed = False
+        self.season_lock = threading.Lock()   # build_mmr runs on worker threads, only one may (re)build the index
         self.rom_to_int = {
             "I": "1",
             "II": "2",
@@ -18,7 +23,7 @@ class UUIDHandler:
             with open("agent_uuids.json") as a:
                 self.agent_uuids = json.load(a)
         except FileNotFoundError:
-            self.agent_uuid_request = requests.get("https://valorant-api.com/v1/agents").json()
+            self.agent_uuid_request = http_client.get("https://valorant-api.com/v1/agents").json()
             print("requested agent uuid information from valorant-api.com")
 
             with open("agent_uuids.json", "w", encoding="utf-8") as f:
@@ -27,58 +32,72 @@ class UUIDHandler:
             with open("agent_uuids.json") as a:
                 self.agent_uuids = json.load(a)
 
-    def agent_converter(self, uuid):
-        result = []
+        # uuid → name and lowercase name → uuid, so conversions don't scan the agent list
+        self.agent_index = {}
+        self.agent_name_index = {}
         for agent in self.agent_uuids["data"]:
-            if agent["uuid"] == uuid.lower():
-                result = agent["displayName"]
-        return result
+            self.agent_index[agent["uuid"].lower()] = agent["displayName"]
+            self.agent_name_index[agent["displayName"].lower()] = agent["uuid"]
+
+    def agent_converter(self, uuid):
+        return self.agent_index.get(str(uuid).lower(), [])
 
     def agent_converter_reversed(self, agent_name):
-        result = []
-        for agent in self.agent_uuids["data"]:
-            if agent["displayName"].lower() == agent_name.lower():
-                result = agent["uuid"]
-        return result
+        return self.agent_name_index.get(agent_name.lower(), [])
 
     def skin_uuid_function(self):
         try:
             with open("skin_uuids.json") as a:
                 self.skin_uuids = json.load(a)
         except FileNotFoundError:
-            self.skin_uuid_request = requests.get("https://valorant-api.com/v1/weapons/skins").json()
+            self.skin_uuid_request = http_client.get("https://valorant-api.com/v1/weapons/skins").json()
             print("requested skin uuid information from valorant-api.com")
 
             with open("skin_uuids.json", "w", encoding="utf-8") as f:
                 json.dump(self.skin_uuid_request, f, indent=2)
 
-            with open("agent_uuids.json") as a:
+            with open("skin_uuids.json") as a:
                 self.skin_uuids = json.load(a)
 
-    def skin_converter(self, skin_uuid):
-        result = []
+        # skin/chroma uuid → display name
+        self.skin_index = {}
         for skin in self.skin_uuids["data"]:
-            if skin["uuid"] == skin_uuid:
-                result = skin["displayName"]
-            for chroma in skin["chromas"]:
-                if chroma["uuid"] == skin_uuid:
-                    result = chroma["displayName"]
-        return result
+            self.skin_index[skin["uuid"].lower()] = skin["displayName"]
+            for chroma in skin.get("chromas", []):
+                self.skin_index[chroma["uuid"].lower()] = chroma["displayName"]
 
-    def season_uuid_function(self, season_uuid):
-        response = requests.get(f"https://valorant-api.com/v1/seasons/{season_uuid}").json()
-        result = None
-        print(response)
-        if response["status"] != 200:
-            result = "Unranked"
-        elif response["data"]["title"] == None:
-            result = response["data"]["assetPath"]
+    def skin_converter(self, skin_uuid):
+        return self.skin_index.get(str(skin_uuid).lower(), [])
+
+    def season_index_function(self, refresh=False):
+        try:
+            if refresh:
+                raise FileNotFoundError
+            with open("season_uuids.json") as a:
+                season_uuids = json.load(a)
+        except (FileNotFoundError, ValueError):
+            season_uuids = http_client.get("https://valorant-api.com/v1/seasons").json()
+            print("requested season uuid information from valorant-api.com")
+
+            write_atomic("season_uuids.json", json.dumps(season_uuids, indent=2))
+
+        # season uuid → normalised act label, built once so lookups don't touch the network.
+        # Filled in locally and published in one step so readers never see a half-built index
+        season_index = {}
+        for season in season_uuids["data"]:
+            season_index[season["uuid"].lower()] = self.season_label(season)
+        self.season_uuids = season_uuids
+        self.season_index = season_index
+
+    def season_label(self, season):
+        if season["title"] == None:
+            result = season["assetPath"]
             result = result[35:-10]
             result = result.replace("_", "")
             result = result.replace("Episode", "e")
             result = result.replace("Act", "a")
         else:
-            result = response["data"]["title"]
+            result = season["title"]
             result = result.replace("EPISODE", "e")
             result = result.replace("ACT", "a")
             result = result.replace("//", "")
@@ -89,10 +108,24 @@ class UUIDHandler:
         result = result.replace(" ", "")
         if result == ("525a5"):
             result = "v25a5"
+        result = result.replace("e10", "v25")
+        result = result.replace("e11", "v26")
         return result
 
-
-
-
-
-
+    def season_uuid_function(self, season_uuid):
+        if self.season_index is None:
+            with self.season_lock:
+                if self.season_index is None:
+                    self.season_index_function()
+        if season_uuid is None:
+            return "Unranked"
+
+        result = self.season_index.get(season_uuid.lower())
+        # A season newer than our cached copy, re-download the list once
+        if result is None:
+            with self.season_lock:
+                if not self.season_index_refreshed:
+                    self.season_index_refreshed = True
+                    self.season_index_function(refresh=True)
+            result = self.season_index.get(season_uuid.lower())
+        return result or "Unranked"
@@ -15,9 +15,17 @@ import math
 import asyncio
 import qasync
 from core.api_client import ValoRank
+from core.http_client import http_client
 from core.dodge_button import dodge
 from core.instalock_agent import instalock_agent
 from core.valorant_uuid import UUIDHandler
+from core.match_watcher import MatchWatcher, AGENTS_CHANGED, MATCH_ENDED
+from core.local_events import LocalEventSubscriber
+from core.asset_manifest import AssetManifest
+from core.asset_pack import AssetPack
+from core.thumbnail_cache import ThumbnailCache
+
+RENDER_INTERVAL_MS = 50     # Rows that finish within this window of each other are drawn in one pass
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller .exe"""
@@ -38,11 +46,12 @@ class WeaponPopup(QDialog):
         "Knife",
     ]
 
-    def __init__(self, player_name, skins, skin_icons, parent=None):
+    def __init__(self, player_name, skins, skin_icons, thumbnails, parent=None):
         super().__init__(parent)
 
         self.skins = skins or {}
         self.skin_icons = skin_icons or {}
+        self.thumbnails = thumbnails
         player_display = player_name or "Unknown"
 
         self.setWindowFlags(
@@ -189,15 +198,11 @@ class WeaponPopup(QDialog):
 
         pixmap = None
         if skin_id:
-            if hasattr(self, "skin_icons"):
-                pixmap = self.skin_icons.get(str(skin_id))
-            else:
-                pixmap = None
+            # Full size image is only decoded by SkinPixmapCache if there's no 120x70 thumbnail yet
+            pixmap = self.thumbnails.get("skins", self.skin_icons, str(skin_id), 120, 70)
 
         if pixmap:
-            preview.setPixmap(
-                pixmap.scaled(120, 70, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            preview.setPixmap(pixmap)
         else:
             preview.setText("No Preview")
             preview.setProperty("empty", "true")
@@ -236,6 +241,9 @@ class ValorantStatsWindow(QMainWindow):
 
         self.valo_rank = ValoRank()
         self.dodge_game = dodge()
+        self.match_watcher = MatchWatcher(self.on_match_transition)
+        # Pushes from the local Riot client tell the watcher when to ask glz, it falls back to timed polling when the socket is down
+        self.local_events = LocalEventSubscriber(self.match_watcher.push, on_connected=self.match_watcher.set_event_driven)
         self.uuid_handler = UUIDHandler()
         self.uuid_handler.agent_uuid_function()
 
@@ -252,6 +260,13 @@ class ValorantStatsWindow(QMainWindow):
         else:
             print("⚠️ Failed to load custom font, falling back to default.")
 
+        # Rows streamed in from valo_stats are batched into one re-render per RENDER_INTERVAL_MS
+        self.pending_players = None
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(RENDER_INTERVAL_MS)
+        self.render_timer.timeout.connect(self.render_pending_players)
+
         self.setWindowTitle("Who Will They Be")
         self.setMinimumSize(1200, 720)
         self.setWindowIcon(QIcon(resource_path("assets/logoone.png")))
@@ -306,15 +321,26 @@ class ValorantStatsWindow(QMainWindow):
         self.progress_bar.setObjectName("loadingBar")
         self.progress_bar.hide()
 
-        # Preload assets
-        from core.asset_loader import download_and_cache_agent_icons
-        self.agent_icons = download_and_cache_agent_icons()
+        # Preload assets, straight from disk while the manifest matches the current game version
+        content_version = self.valo_rank.version_data["data"]["version"]
+        self.asset_manifest = AssetManifest(content_version)
+        # Packed icons from tools/build_asset_pack.py, None until it's been built for this version
+        self.asset_pack = AssetPack.open(content_version)
+        # Icons scaled to each size the cards use, reused across refreshes and launches
+        self.thumbnails = ThumbnailCache(content_version)
+
+        # All three download through the shared async pipeline, so a cold start doesn't block the window
+        from core.asset_loader import download_and_cache_agent_icons, download_and_cache_rank_icons, download_and_cache_skins
+        self.agent_icons = {}
+        self.rank_icons = {}
 
-        from core.asset_loader import download_and_cache_rank_icons
-        self.rank_icons = download_and_cache_rank_icons()
+        task = asyncio.create_task(download_and_cache_agent_icons(manifest=self.asset_manifest, pack=self.asset_pack))
+        task.add_done_callback(self._on_agent_icons_loaded)
 
-        from core.asset_loader import download_and_cache_skins
-        task = asyncio.create_task(download_and_cache_skins())
+        task = asyncio.create_task(download_and_cache_rank_icons(manifest=self.asset_manifest, pack=self.asset_pack))
+        task.add_done_callback(self._on_rank_icons_loaded)
+
+        task = asyncio.create_task(download_and_cache_skins(manifest=self.asset_manifest, pack=self.asset_pack))
         task.add_done_callback(self._on_skins_loaded)
 
         # ─────────────── Layout ───────────────
@@ -407,12 +433,20 @@ class ValorantStatsWindow(QMainWindow):
     # ---------------------------------------------------------
     # Utility setup methods
     # ---------------------------------------------------------
+    def _on_agent_icons_loaded(self, task):
+        self.agent_icons = task.result()
+        self.safe_load_players(self.valo_rank.frontend_data)
+
+    def _on_rank_icons_loaded(self, task):
+        self.rank_icons = task.result()
+        self.safe_load_players(self.valo_rank.frontend_data)
+
     def _on_skins_loaded(self, task):
         self.skin_icons = task.result()
         self.safe_load_players(self.valo_rank.frontend_data)
 
     def open_skin_popup(self, player_name, skins):
-        popup = WeaponPopup(player_name, skins, getattr(self, "skin_icons", {}), self)
+        popup = WeaponPopup(player_name, skins, getattr(self, "skin_icons", {}), self.thumbnails, self)
         popup.exec()
 
     def build_meta_chip(self, label_text):
@@ -615,11 +649,9 @@ class ValorantStatsWindow(QMainWindow):
         agent_icon_label.setAlignment(Qt.AlignCenter)
 
         agent_name = str(player.get("agent", "Unknown"))
-        agent_icon = self.agent_icons.get(agent_name)
+        agent_icon = self.thumbnails.get("agents", self.agent_icons, agent_name, 64)
         if agent_icon:
-            agent_icon_label.setPixmap(
-                agent_icon.scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            agent_icon_label.setPixmap(agent_icon)
         else:
             agent_icon_label.setText(agent_name)
         card_layout.addWidget(agent_icon_label)
@@ -668,11 +700,9 @@ class ValorantStatsWindow(QMainWindow):
         rank_icon_label.setAlignment(Qt.AlignCenter)
 
         rank_name = str(player.get("rank", "Unknown"))
-        rank_icon = self.rank_icons.get(rank_name)
+        rank_icon = self.thumbnails.get("ranks", self.rank_icons, rank_name, 44)
         if rank_icon:
-            rank_icon_label.setPixmap(
-                rank_icon.scaled(44, 44, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            rank_icon_label.setPixmap(rank_icon)
         else:
             rank_icon_label.setText(rank_name if rank_name not in ("[]", "") else "N/A")
         rank_display.addWidget(rank_icon_label)
@@ -705,11 +735,9 @@ class ValorantStatsWindow(QMainWindow):
         peak_icon_label.setAlignment(Qt.AlignCenter)
 
         peak_name = str(player.get("peak_rank", "Unknown"))
-        peak_icon = self.rank_icons.get(peak_name)
+        peak_icon = self.thumbnails.get("ranks", self.rank_icons, peak_name, 44)
         if peak_icon:
-            peak_icon_label.setPixmap(
-                peak_icon.scaled(44, 44, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            peak_icon_label.setPixmap(peak_icon)
         elif peak_name == "[]":
             peak_icon_label.setText("N/A")
         else:
@@ -781,11 +809,9 @@ class ValorantStatsWindow(QMainWindow):
         agent_icon_label.setAlignment(Qt.AlignCenter)
 
         agent_name = str(player.get("agent", "Unknown"))
-        agent_icon = self.agent_icons.get(agent_name)
+        agent_icon = self.thumbnails.get("agents", self.agent_icons, agent_name, 44)
         if agent_icon:
-            agent_icon_label.setPixmap(
-                agent_icon.scaled(44, 44, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            agent_icon_label.setPixmap(agent_icon)
         else:
             agent_icon_label.setText(agent_name)
 
@@ -831,11 +857,9 @@ class ValorantStatsWindow(QMainWindow):
         rank_icon_label.setAlignment(Qt.AlignCenter)
 
         rank_name = str(player.get("rank", "Unknown"))
-        rank_icon = self.rank_icons.get(rank_name)
+        rank_icon = self.thumbnails.get("ranks", self.rank_icons, rank_name, 32)
         if rank_icon:
-            rank_icon_label.setPixmap(
-                rank_icon.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            rank_icon_label.setPixmap(rank_icon)
         else:
             rank_icon_label.setText(rank_name if rank_name not in ("[]", "") else "N/A")
         meta_bar.addWidget(rank_icon_label)
@@ -855,11 +879,9 @@ class ValorantStatsWindow(QMainWindow):
         peak_icon_label.setAlignment(Qt.AlignCenter)
 
         peak_name = str(player.get("peak_rank", "Unknown"))
-        peak_icon = self.rank_icons.get(peak_name)
+        peak_icon = self.thumbnails.get("ranks", self.rank_icons, peak_name, 32)
         if peak_icon:
-            peak_icon_label.setPixmap(
-                peak_icon.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            peak_icon_label.setPixmap(peak_icon)
         elif peak_name == "[]":
             peak_icon_label.setText("N/A")
         else:
@@ -1291,6 +1313,16 @@ class ValorantStatsWindow(QMainWindow):
     def safe_load_players(self, data):
         QTimer.singleShot(0, lambda: self.load_players(data))
 
+    # on_update callback for ValoRank, called every time a player's row (or the skins) is ready
+    def queue_player_update(self, data):
+        self.pending_players = data
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def render_pending_players(self):
+        if self.pending_players is not None:
+            self.load_players(self.pending_players)
+
     def run_dodge_button(self):
         if self.dodge_button.isEnabled():
             self.dodge_button.setEnabled(False)
@@ -1315,29 +1347,44 @@ class ValorantStatsWindow(QMainWindow):
         self.progress_bar.show()
         self.progress_bar.setRange(0, 0)
         try:
-            await self.valo_rank.load_more_matches()
+            await self.valo_rank.load_more_matches(on_update=self.queue_player_update)
+            self.render_timer.stop()
             self.safe_load_players(self.valo_rank.frontend_data)
         finally:
             self.refresh_button.setEnabled(True)
             self.load_more_matches_button.setEnabled(True)
             self.progress_bar.hide()
 
-    async def refresh_data(self):
+    async def refresh_data(self, handler=None):
         if not self.refresh_button.isEnabled():
-            return
+            return False
 
         self.refresh_button.setEnabled(False)
         self.progress_bar.show()
         self.progress_bar.setRange(0, 0) # Indeterminate mode
         try:
             print("Fetching latest Valorant stats...")
-            await self.valo_rank.valo_stats()
+            await self.valo_rank.valo_stats(on_update=self.queue_player_update, handler=handler)
             print("✅ Data fetched. Refreshing table...")
+            self.render_timer.stop()    # The full refresh below covers any queued partial render
             self.safe_load_players(self.valo_rank.frontend_data)
             self.update_metadata()
         finally:
             self.refresh_button.setEnabled(True)
             self.progress_bar.hide()
+        return True
+
+    # Called by the match watcher whenever the match state changes, returns False to have it retried next poll
+    async def on_match_transition(self, transition, previous, current, handler):
+        if transition == AGENTS_CHANGED:
+            self.valo_rank.apply_agents(current.agents)
+            self.queue_player_update(self.valo_rank.frontend_data)
+            return True
+        if transition == MATCH_ENDED:
+            self.valo_rank.match_ended()
+            return await self.refresh_data()
+        # MATCH_FOUND / MATCH_STARTED, valo_stats only loads the players it hasn't seen yet
+        return await self.refresh_data(handler=handler)
 
     # ---------------------------------------------------------
     # Main data-loading logic (two-column layout)
@@ -1421,6 +1468,8 @@ async def main():
     window = ValorantStatsWindow([])
     window.show()
     asyncio.create_task(window.refresh_data())
+    window.match_watcher.start()
+    window.local_events.start()
     return window
 
 
@@ -1433,4 +1482,7 @@ if __name__ == "__main__":
 
     window = loop.run_until_complete(main())
     with loop:
-        loop.run_forever()
\ No newline at end of file
+        loop.run_forever()
+        window.match_watcher.stop()
+        window.local_events.stop()
+        loop.run_until_complete(http_client.aclose())
\ No newline at end of file
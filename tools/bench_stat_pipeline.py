@@ -0,0 +1,159 @@
+"""
+Wall-clock benchmark of the stat pipeline's network pattern: one name-service lookup, then MMR + match history
++ 5 match details per player (~70 pd requests for a 10 player lobby, like a real refresh).
+Runs a local aiohttp server that answers like pd.eu.a.pvp.net with a fixed latency, then loads the lobby twice:
+once the old way (blocking requests.get calls, one player after another, no rate limiting) and once the way
+valo_stats does now (awaitable requests, every player at the same time).
+
+The concurrent pass goes through HTTPClient with the app's own HOST_LIMITS/HOST_RATES: requests go to
+pd.bench.a.pvp.net, which is resolved to the local server, so they're paced by the "pd" bucket and
+connection limit exactly like real Riot requests.
+
+    python -m tools.bench_stat_pipeline --latency 0.08
+"""
+import time
+import json
+import socket
+import random
+import asyncio
+import argparse
+import requests
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+from core.http_client import HTTPClient
+from core.schemas import match_details_decoder, match_history_decoder, mmr_decoder
+from core.stat_engine import MatchSummary, PlayerStatColumns, RunningStats
+
+PLAYERS = 10
+MATCHES_PER_PLAYER = 5
+BENCH_HOST = "pd.bench.a.pvp.net"     # Counts as "pd" for the rate limiter and connection limits
+
+
+class LocalResolver(AbstractResolver):
+    """Resolves every host to 127.0.0.1 so the benchmark can use a Riot-looking host name."""
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return [{"hostname": host, "host": "127.0.0.1", "port": port, "family": socket.AF_INET, "proto": 0, "flags": 0}]
+
+    async def close(self):
+        pass
+
+
+def fake_match(match_id, puuids):
+    rng = random.Random(match_id)
+    players = []
+    round_stats = []
+    for i, puuid in enumerate(puuids):
+        players.append({
+            "subject": puuid,
+            "gameName": f"Player{i}",
+            "tagLine": "0000",
+            "teamId": "Red" if i % 2 else "Blue",
+            "accountLevel": rng.randint(20, 400),
+            "stats": {"score": rng.randint(2000, 8000), "roundsPlayed": 24, "kills": rng.randint(5, 30), "deaths": rng.randint(5, 25)},
+        })
+        round_stats.append({"subject": puuid, "damage": [{"headshots": 1, "bodyshots": 3, "legshots": 0}]})
+    return {
+        "matchInfo": {"matchId": match_id, "isCompleted": True},
+        "players": players,
+        "teams": [{"teamId": "Red", "won": rng.random() > 0.5}, {"teamId": "Blue", "won": rng.random() > 0.5}],
+        "roundResults": [{"playerStats": round_stats} for _ in range(24)],
+    }
+
+
+def build_app(latency, puuids):
+    async def delayed(body):
+        await asyncio.sleep(latency)
+        return web.Response(body=json.dumps(body).encode(), content_type="application/json")
+
+    async def mmr(request):
+        return await delayed({"LatestCompetitiveUpdate": {"TierAfterUpdate": 15, "RankedRatingAfterUpdate": 40}, "QueueSkills": {}})
+
+    async def history(request):
+        puuid = request.match_info["puuid"]
+        match_ids = [f"{puuid}-{i}" for i in range(MATCHES_PER_PLAYER)]
+        return await delayed({"Total": len(match_ids), "History": [{"MatchID": match_id} for match_id in match_ids]})
+
+    async def details(request):
+        return await delayed(fake_match(request.match_info["match_id"], puuids))
+
+    async def names(request):
+        subjects = await request.json()
+        return await delayed([{"Subject": puuid, "GameName": puuid, "TagLine": "0000"} for puuid in subjects])
+
+    app = web.Application()
+    app.router.add_put("/name-service/v2/players", names)
+    app.router.add_get("/mmr/v1/players/{puuid}", mmr)
+    app.router.add_get("/match-history/v1/history/{puuid}", history)
+    app.router.add_get("/match-details/v1/matches/{match_id}", details)
+    return app
+
+
+def summarise(puuid, matches):
+    running = RunningStats()
+    running.fold(PlayerStatColumns(puuid, [MatchSummary.from_details(match.match_info.match_id, match) for match in matches]))
+    return running.summary()
+
+
+# The pre-async pattern: bare requests calls, no connection reuse, no rate limiter
+def serialized(base, puuids):
+    requests.put(f"{base}/name-service/v2/players", json=puuids)
+    for puuid in puuids:
+        mmr_decoder.decode(requests.get(f"{base}/mmr/v1/players/{puuid}").content)
+        history = match_history_decoder.decode(requests.get(f"{base}/match-history/v1/history/{puuid}").content)
+        matches = [
+            match_details_decoder.decode(requests.get(f"{base}/match-details/v1/matches/{entry.match_id}").content)
+            for entry in history.history
+        ]
+        summarise(puuid, matches)
+
+
+async def concurrent(client, base, puuids):
+    await client.request("PUT", f"{base}/name-service/v2/players", json=puuids)
+
+    async def collector(puuid):
+        mmr_decoder.decode((await client.request("GET", f"{base}/mmr/v1/players/{puuid}")).content)
+        history = match_history_decoder.decode((await client.request("GET", f"{base}/match-history/v1/history/{puuid}")).content)
+        responses = await asyncio.gather(*(
+            client.request("GET", f"{base}/match-details/v1/matches/{entry.match_id}") for entry in history.history
+        ))
+        summarise(puuid, [match_details_decoder.decode(response.content) for response in responses])
+
+    await asyncio.gather(*(collector(puuid) for puuid in puuids))
+
+
+async def main(latency, connections):
+    puuids = [f"puuid-{i}" for i in range(PLAYERS)]
+    runner = web.AppRunner(build_app(latency, puuids))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    client = HTTPClient(host_limits={"pd": connections}, resolver=LocalResolver())
+    bucket = client.rate_limiter.bucket(BENCH_HOST)
+    try:
+        requests_made = 1 + PLAYERS * (2 + MATCHES_PER_PLAYER)
+        print(f"{PLAYERS} players, {requests_made} requests, {latency * 1000:.0f}ms latency, {connections} connections")
+        print(f"pd bucket: {bucket.rate:.0f} req/s, burst {bucket.capacity}")
+
+        start = time.perf_counter()
+        await asyncio.to_thread(serialized, f"http://127.0.0.1:{port}", puuids)
+        serial_time = time.perf_counter() - start
+        print(f"Serialized (unthrottled): {serial_time:.2f}s")
+
+        start = time.perf_counter()
+        await concurrent(client, f"http://{BENCH_HOST}:{port}", puuids)
+        concurrent_time = time.perf_counter() - start
+        print(f"Concurrent (rate limited): {concurrent_time:.2f}s ({serial_time / concurrent_time:.1f}x faster)")
+    finally:
+        await client.aclose()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.08, help="Seconds the fake server waits before each response")
+    parser.add_argument("--connections", type=int, default=10, help="pd connection limit, the app uses 10")
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.connections))
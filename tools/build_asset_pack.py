@@ -0,0 +1,62 @@
+"""
+Packs every icon listed in the asset manifest into one file the app maps on startup instead of
+opening thousands of PNGs. Run it after the app has downloaded the icons for the current patch:
+
+    python -m tools.build_asset_pack
+    python -m tools.build_asset_pack --manifest cache/asset_manifest.json -o cache/assets.pack
+
+The pack is stamped with the manifest's content version, so after a patch the app ignores it
+and falls back to the loose files until it's rebuilt.
+"""
+import sys
+import json
+import time
+import argparse
+from core.asset_manifest import AssetManifest, MANIFEST_PATH
+from core.asset_pack import AssetPack, build_pack, PACK_PATH
+
+SECTIONS = ("agents", "ranks", "skins")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    parser.add_argument("-o", "--output", default=PACK_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.manifest, encoding="utf-8") as f:
+            version = json.load(f).get("version")
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(f"❌ Can't read {args.manifest}: {e}")
+
+    manifest = AssetManifest(version, args.manifest)
+    sections = {}
+    for name in SECTIONS:
+        entries = manifest.section(name)
+        if entries is None:
+            sys.exit(f"❌ {name} aren't fully downloaded for {version}, start the app once and try again")
+        sections[name] = entries
+
+    started = time.perf_counter()
+    count = build_pack(version, sections, args.output)
+
+    # Read it back the way the app does to make sure every entry resolves, and decode one icon per section
+    from PySide6.QtGui import QImage
+    pack = AssetPack.open(version, args.output)
+    for name, entries in sections.items():
+        for key in entries:
+            if pack.get(name, key) is None:
+                sys.exit(f"❌ {name}/{key} missing from {args.output}")
+        key = next(iter(entries), None)
+        if key is not None and QImage.fromData(bytes(pack.get(name, key))).isNull():
+            sys.exit(f"❌ {name}/{key} in {args.output} doesn't decode as an image")
+    size = len(pack.buffer)
+    pack.close()
+
+    print(f"📦 Packed {count} icons ({size / 1024 / 1024:.1f} MB) into {args.output} "
+          f"for {version} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
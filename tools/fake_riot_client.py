@@ -0,0 +1,160 @@
+"""
+Stand-in for the local Riot client's websocket, for trying LocalEventSubscriber without the game running.
+Checks riot:<password> basic auth, honours [5, "<event>"] subscriptions and pushes a scripted
+lobby → agent select → core-game → menus sequence as [8, "<event>", payload] messages.
+
+    python -m tools.fake_riot_client --port 51234 --password test
+    python -m tools.fake_riot_client --self-test
+"""
+import sys
+import json
+import base64
+import asyncio
+import argparse
+from aiohttp import web, WSMsgType
+from core.http_client import http_client
+from core.local_events import LocalEventSubscriber, SUBSCRIBE, EVENT
+from core.match_watcher import MENUS, PREGAME, INGAME
+
+PUUID = "00000000-0000-0000-0000-000000000000"
+MATCH_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def presence(loop_state):
+    private = base64.b64encode(json.dumps({"sessionLoopState": loop_state}).encode()).decode()
+    return ("OnJsonApiEvent_chat_v4_presences", {
+        "data": {"presences": [{"puuid": PUUID, "private": private}]},
+        "eventType": "Update",
+        "uri": "/chat/v4/presences",
+    })
+
+
+def ares_message(service, resource):
+    return ("OnJsonApiEvent_riot-messaging-service_v1_message", {
+        "data": {"service": service, "resource": resource},
+        "eventType": "Create",
+        "uri": f"/riot-messaging-service/v1/message/{resource}",
+    })
+
+
+# (seconds to wait, event) pairs pushed to every client in order
+SCRIPT = [
+    (1.0, ("OnJsonApiEvent_chat_v4_presences", {
+        "data": {"presences": [{"puuid": "someone-else", "private": ""}]},    # A friend, should be ignored
+        "eventType": "Update",
+        "uri": "/chat/v4/presences",
+    })),
+    (1.0, presence("PREGAME")),
+    (0.5, ares_message("ares-pregame", f"ares-pregame/pregame/v1/matches/{MATCH_ID}")),
+    (0.5, ares_message("ares-pregame", f"ares-pregame/pregame/v1/matches/{MATCH_ID}")),
+    (1.0, ares_message("ares-contracts", "ares-contracts/contracts/v1/contracts")),     # Not match related
+    (1.0, presence("INGAME")),
+    (0.5, ares_message("ares-core-game", f"ares-core-game/core-game/v1/matches/{MATCH_ID}")),
+    (2.0, presence("MENUS")),
+]
+# What should get through is_match_event, in order: everything except the friend's presence and the contracts push,
+# with the (phase, match ID) decoded from each push
+EXPECTED_EVENTS = [
+    ("/chat/v4/presences", PREGAME, None),
+    (f"/riot-messaging-service/v1/message/ares-pregame/pregame/v1/matches/{MATCH_ID}", PREGAME, MATCH_ID),
+    (f"/riot-messaging-service/v1/message/ares-pregame/pregame/v1/matches/{MATCH_ID}", PREGAME, MATCH_ID),
+    ("/chat/v4/presences", INGAME, None),
+    (f"/riot-messaging-service/v1/message/ares-core-game/core-game/v1/matches/{MATCH_ID}", INGAME, MATCH_ID),
+    ("/chat/v4/presences", MENUS, None),
+]
+
+
+def build_app(password, loop_script):
+    expected = "Basic " + base64.b64encode(f"riot:{password}".encode()).decode()
+
+    async def websocket(request):
+        if request.headers.get("Authorization") != expected:
+            return web.Response(status=401)
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscriptions = set()
+
+        async def push():
+            while True:
+                for delay, (name, payload) in SCRIPT:
+                    await asyncio.sleep(delay)
+                    if name in subscriptions:
+                        print(f"→ {name} {payload['uri']}")
+                        await ws.send_str(json.dumps([EVENT, name, payload]))
+                if not loop_script:
+                    break
+
+        pusher = asyncio.create_task(push())
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                opcode, name = json.loads(message.data)[:2]
+                if opcode == SUBSCRIBE:
+                    subscriptions.add(name)
+                    print(f"subscribed: {name}")
+        finally:
+            pusher.cancel()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", websocket)
+    return app
+
+
+async def serve(port, password, loop_script=True):
+    runner = web.AppRunner(build_app(password, loop_script))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+# Runs the fake client and a real LocalEventSubscriber against it, fails unless exactly EXPECTED_EVENTS get through
+async def self_test(password):
+    runner, port = await serve(0, password, loop_script=False)
+    received = []
+    subscriber = LocalEventSubscriber(
+        lambda name, payload, phase, match_id: received.append((payload["uri"], phase, match_id)),
+        on_connected=lambda connected: print(f"connected: {connected}"),
+        url=f"ws://127.0.0.1:{port}/",
+        password=password,
+        puuid=PUUID,
+    )
+    subscriber.start()
+    await asyncio.sleep(sum(delay for delay, _ in SCRIPT) + 1.0)
+    subscriber.stop()
+    await http_client.aclose()
+    await runner.cleanup()
+
+    print(f"{len(received)} of {len(SCRIPT)} events reached the subscriber:")
+    for uri, phase, match_id in received:
+        print(f"  {uri} ({phase}, {match_id})")
+    if received != EXPECTED_EVENTS:
+        print(f"❌ Expected {len(EXPECTED_EVENTS)} events:")
+        for uri, phase, match_id in EXPECTED_EVENTS:
+            print(f"  {uri} ({phase}, {match_id})")
+        return False
+    print("✅ Self-test passed")
+    return True
+
+
+async def main(port, password):
+    runner, port = await serve(port, password)
+    print(f"Fake Riot client websocket on ws://127.0.0.1:{port}/ (riot:{password})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--password", default="test")
+    parser.add_argument("--self-test", action="store_true", help="Connect a LocalEventSubscriber to the fake client and report what it received")
+    args = parser.parse_args()
+    if args.self_test:
+        sys.exit(0 if asyncio.run(self_test(args.password)) else 1)
+    asyncio.run(main(args.port, args.password))